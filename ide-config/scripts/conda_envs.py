@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+conda_envs.py - Conda environment discovery for Dev Environment Readyifier
+
+This script finds conda, mamba and micromamba environments by reading conda's
+environments registry and the `envs/` directories of known install roots,
+confirming each candidate with a stat of its `conda-meta` directory (a root
+need not be an environment itself for its `envs/` to be scanned). The
+`conda info --envs --json` CLI, which loads all of conda, is only used when
+those sources yield no environment.
+"""
+
+import os
+import json
+import platform
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from scripts.path_index import which
+    from scripts.detection_profile import note_subprocess
+except ImportError:
+    from path_index import which
+    from detection_profile import note_subprocess
+
+# Default install locations relative to the home directory
+HOME_ROOTS = [
+    "miniconda3", "miniconda", "anaconda3", "anaconda",
+    "miniforge3", "mambaforge", "micromamba", ".micromamba"
+]
+
+SYSTEM_ROOTS = ["/opt/conda", "/opt/miniconda3", "/opt/anaconda3", "/opt/miniforge3", "/usr/local/miniconda3"]
+
+
+def is_conda_env(path: str) -> bool:
+    """Check whether a directory is a conda environment."""
+    return os.path.isdir(os.path.join(path, "conda-meta"))
+
+
+def registry_path() -> str:
+    """Get the environments registry conda and mamba append to on create."""
+    return os.path.join(str(Path.home()), ".conda", "environments.txt")
+
+
+def read_registry(path: Optional[str] = None) -> List[str]:
+    """Read environment prefixes from the registry file."""
+    try:
+        with open(path or registry_path(), 'r') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except OSError:
+        return []
+
+
+def candidate_roots() -> List[str]:
+    """Get install roots from the environment, PATH and the default locations."""
+    roots = []
+
+    # conda/mamba/micromamba export these when activated or initialized
+    for var in ("CONDA_ROOT", "MAMBA_ROOT_PREFIX"):
+        if os.environ.get(var):
+            roots.append(os.environ[var])
+    for var in ("CONDA_EXE", "MAMBA_EXE"):
+        if os.environ.get(var):
+            # <root>/bin/conda or <root>/condabin/conda
+            roots.append(os.path.dirname(os.path.dirname(os.environ[var])))
+
+    for exe in ("conda", "mamba"):
+        path = which(exe)
+        if path:
+            roots.append(os.path.dirname(os.path.dirname(os.path.realpath(path))))
+
+    home = str(Path.home())
+    roots.extend(os.path.join(home, name) for name in HOME_ROOTS)
+    if platform.system() == "Windows":
+        local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        program_data = os.environ.get("ProgramData", "C:\\ProgramData")
+        roots.extend(os.path.join(base, name) for base in (local, program_data) for name in HOME_ROOTS)
+    else:
+        roots.extend(SYSTEM_ROOTS)
+
+    return roots
+
+
+def _env_dirs(root: str) -> List[str]:
+    """List environments under a root's envs/ directory."""
+    try:
+        with os.scandir(os.path.join(root, "envs")) as entries:
+            return sorted(entry.path for entry in entries if entry.is_dir())
+    except OSError:
+        return []
+
+
+def _from_cli(timeout: float) -> List[str]:
+    """Get environment prefixes from `conda info --envs --json`."""
+    conda = which("conda") or os.environ.get("CONDA_EXE")
+    if not conda:
+        return []
+    try:
+        note_subprocess()
+        result = subprocess.run(
+            [conda, "info", "--envs", "--json"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout
+        )
+        if result.returncode == 0:
+            return json.loads(result.stdout).get("envs", [])
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        pass
+    return []
+
+
+def find_environments(use_cli_fallback: bool = True, timeout: float = 15.0) -> List[Dict[str, str]]:
+    """Find conda, mamba and micromamba environments.
+
+    Args:
+        use_cli_fallback: Ask the conda CLI when no registry exists and no root holds an environment
+        timeout: Seconds the CLI fallback may take
+
+    Returns:
+        Environments as {"name", "path"} dicts, roots before their envs
+    """
+    prefixes = []
+    registry = read_registry()
+    for root in candidate_roots():
+        # A micromamba root (MAMBA_ROOT_PREFIX) may hold envs/ without a base
+        # environment of its own, so each candidate is checked separately below
+        if os.path.isdir(root):
+            prefixes.append(root)
+            prefixes.extend(_env_dirs(root))
+    found = any(is_conda_env(prefix) for prefix in prefixes)
+    prefixes.extend(registry)
+
+    if not found and not registry and use_cli_fallback:
+        prefixes = _from_cli(timeout)
+
+    environments = []
+    seen = set()
+    for prefix in prefixes:
+        key = os.path.normcase(os.path.realpath(prefix))
+        if key in seen or not is_conda_env(prefix):
+            continue
+        seen.add(key)
+        environments.append({
+            "name": os.path.basename(prefix.rstrip("/\\")),
+            "path": prefix
+        })
+
+    return environments
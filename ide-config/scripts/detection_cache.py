@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+detection_cache.py - Persistent detection cache for Dev Environment Readyifier
+
+This script stores EnvironmentDetector results on disk, keyed by a fingerprint
+of the environment (PATH and the mtimes of the binaries and directories the
+detector looks at), so unchanged machines skip re-detection entirely.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+CACHE_FORMAT_VERSION = 2
+
+
+def default_cache_dir() -> str:
+    """Get the per-user cache directory for Dev Environment Readyifier."""
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA", os.path.join(str(Path.home()), "AppData", "Local"))
+    elif platform.system() == "Darwin":
+        base = os.path.join(str(Path.home()), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(str(Path.home()), ".cache"))
+    return os.path.join(base, "dev-env-readyifier")
+
+
+class DetectionCache:
+    """Stores detection results on disk, keyed by an environment fingerprint."""
+
+    def __init__(self, cache_path: Optional[str] = None, max_age: float = 24 * 60 * 60):
+        """Initialize the detection cache.
+
+        Args:
+            cache_path: Path of the cache file (defaults to the per-user cache directory)
+            max_age: Seconds after which a cached result is ignored even if the fingerprint matches
+        """
+        self.cache_path = cache_path or os.path.join(default_cache_dir(), "detection.json")
+        self.max_age = max_age
+
+    def fingerprint(self, paths: List[str]) -> str:
+        """Compute a fingerprint of PATH and the mtimes of the given paths."""
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}\0{sys.executable}\0{platform.platform()}\0".encode())
+        digest.update(os.environ.get("PATH", "").encode())
+        for path in paths:
+            try:
+                stamp = str(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamp = "-"
+            digest.update(f"\0{path}={stamp}".encode())
+        return digest.hexdigest()
+
+    def load(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Load cached results if they match the fingerprint and are not too old."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("fingerprint") != fingerprint:
+            return None
+        if time.time() - entry.get("created", 0) > self.max_age:
+            return None
+        return entry.get("results")
+
+    def save(self, fingerprint: str, results: Dict[str, Any]) -> bool:
+        """Save results for the fingerprint, replacing any previous entry."""
+        entry = {
+            "fingerprint": fingerprint,
+            "created": time.time(),
+            "results": results
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except OSError as e:
+            print(f"Error writing detection cache: {e}")
+            return False
+
+    def clear(self):
+        """Remove the cache file."""
+        try:
+            os.remove(self.cache_path)
+        except OSError:
+            pass
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+detection_daemon.py - Long-running detection service for Dev Environment Readyifier
+
+This script keeps EnvironmentDetector results warm in memory and serves them
+over a local Unix socket, so IDE plugins and the web UI can ask for fresh
+environment data without re-running every probe. The directories the probes
+depend on (PATH entries, site-packages, the VS Code extensions folder, conda
+roots and registries) are watched with inotify on Linux, or by polling their
+mtimes elsewhere, and a change re-runs only the probes that depend on it.
+
+Clients send one line ("get", "refresh" or "ping") and receive one line of JSON.
+"""
+
+import os
+import sys
+import json
+import time
+import ctypes
+import ctypes.util
+import select
+import signal
+import socket
+import struct
+import platform
+import importlib
+import threading
+import socketserver
+from typing import Dict, List, Any, Optional, Set
+
+try:
+    from scripts.detector import EnvironmentDetector, PROBE_CATALOG
+    from scripts.probe_engine import ProbeEngine
+    from scripts.path_index import reset_path_index
+    from scripts.detection_cache import default_cache_dir
+except ImportError:
+    from detector import EnvironmentDetector, PROBE_CATALOG
+    from probe_engine import ProbeEngine
+    from path_index import reset_path_index
+    from detection_cache import default_cache_dir
+
+# inotify event bits, see inotify(7)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+    IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+# struct inotify_event header: wd, mask, cookie, len (followed by len bytes of name)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def default_socket_path() -> str:
+    """Get the per-user socket path of the detection daemon."""
+    return os.path.join(default_cache_dir(), "detectiond.sock")
+
+
+class InotifyWatcher:
+    """Reports changed directories using Linux inotify."""
+
+    def __init__(self):
+        """Initialize an inotify instance; raises OSError if inotify is unavailable."""
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: Dict[int, str] = {}
+
+    def watch(self, directory: str) -> bool:
+        """Watch a directory, returning False if it cannot be watched (e.g. it does not exist)."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._directories[wd] = directory
+        return True
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """Wait for changes, returning the changed directories or None if events were lost."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                directory = self._directories.get(wd)
+                if directory:
+                    changed.add(directory)
+                if mask & IN_IGNORED:
+                    # The directory was deleted or unmounted
+                    self._directories.pop(wd, None)
+        return None if overflow else changed
+
+    def close(self):
+        """Release the inotify instance."""
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Reports changed directories by comparing their mtimes, where inotify is unavailable."""
+
+    def __init__(self, interval: float = 2.0):
+        """Initialize the watcher, checking every interval seconds."""
+        self.interval = interval
+        self._stamps: Dict[str, Optional[int]] = {}
+
+    @staticmethod
+    def _stamp(directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def watch(self, directory: str) -> bool:
+        """Watch a directory; missing directories are watched for their creation."""
+        self._stamps[directory] = self._stamp(directory)
+        return True
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """Wait up to timeout seconds and return the directories whose mtime changed."""
+        time.sleep(min(timeout, self.interval))
+        changed = set()
+        for directory, stamp in self._stamps.items():
+            current = self._stamp(directory)
+            if current != stamp:
+                self._stamps[directory] = current
+                changed.add(directory)
+        return changed
+
+    def close(self):
+        """Nothing to release."""
+        pass
+
+
+def create_watcher(poll_interval: float = 2.0):
+    """Get an inotify watcher on Linux, falling back to polling."""
+    if platform.system() == "Linux":
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(poll_interval)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers one command per connection."""
+
+    def handle(self):
+        command = self.rfile.readline(64).decode(errors="replace").strip() or "get"
+        self.wfile.write(self.server.detection_daemon.respond(command))
+
+
+class DetectionDaemon:
+    """Keeps detection results warm and serves them over a Unix socket."""
+
+    def __init__(
+        self,
+        detector: Optional[EnvironmentDetector] = None,
+        socket_path: Optional[str] = None,
+        settle_time: float = 0.2,
+        poll_interval: float = 2.0
+    ):
+        """Initialize the daemon.
+
+        Args:
+            detector: Detector to run probes with (defaults to a new EnvironmentDetector)
+            socket_path: Unix socket to serve on (defaults to the per-user cache directory)
+            settle_time: Seconds to wait for more events before re-probing, so an
+                install that touches many files triggers one re-probe
+            poll_interval: Seconds between checks when inotify is unavailable
+        """
+        self.detector = detector or EnvironmentDetector()
+        self.socket_path = socket_path or default_socket_path()
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+
+        self._probe_results: Dict[str, Any] = {}
+        self._timed_out: List[str] = []
+        self._results: Dict[str, Any] = {}
+        # Pre-encoded response, swapped whole so readers never wait on a re-probe
+        self._payload = b"{}\n"
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._watch_map: Dict[str, List[str]] = {}
+        # Missing directories, by the existing ancestor watched in their place
+        self._pending: Dict[str, List[str]] = {}
+        self._watcher = None
+        self._server = None
+
+    def results(self) -> Dict[str, Any]:
+        """Get the current detection results."""
+        return self._results
+
+    def refresh(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Re-run probes and update the served results.
+
+        Args:
+            names: Probes to re-run (defaults to all of them)
+        """
+        with self._refresh_lock:
+            # Executables and packages may have changed since the last run
+            reset_path_index()
+            importlib.invalidate_caches()
+            engine = ProbeEngine(PROBE_CATALOG, self.detector.os_type, self.detector.probe_timeout)
+
+            probe_results, timed_out = self.detector.run_probes(engine, names)
+            self._probe_results.update(probe_results)
+            self._timed_out = [name for name in self._timed_out if name not in probe_results] + timed_out
+
+            results = self.detector.assemble_results(self._probe_results, self._timed_out)
+            self._results = results
+            self._payload = (json.dumps(results) + "\n").encode()
+
+            # Keep the on-disk cache warm for setup.py runs too
+            if not self._timed_out:
+                fingerprint = self.detector.cache.fingerprint(self.detector._fingerprint_paths(engine))
+                self.detector.cache.save(fingerprint, results)
+            return results
+
+    def respond(self, command: str) -> bytes:
+        """Get the response to a client command."""
+        if command == "get":
+            return self._payload
+        if command == "refresh":
+            self.refresh()
+            return self._payload
+        if command == "ping":
+            return b'{"status": "ok"}\n'
+        return (json.dumps({"error": f"Unknown command: {command}"}) + "\n").encode()
+
+    def _watch(self, directory: str):
+        """Watch a directory, or its nearest existing ancestor until it is created."""
+        if self._watcher.watch(directory):
+            return
+        ancestor = os.path.dirname(directory)
+        while ancestor and ancestor != os.path.dirname(ancestor) and not os.path.isdir(ancestor):
+            ancestor = os.path.dirname(ancestor)
+        if ancestor and self._watcher.watch(ancestor):
+            self._pending.setdefault(ancestor, []).append(directory)
+
+    def _watch_all(self):
+        """Watch every directory a probe depends on."""
+        engine = ProbeEngine(PROBE_CATALOG, self.detector.os_type, self.detector.probe_timeout)
+        self._watch_map = self.detector.watch_paths(engine)
+        for directory in self._watch_map:
+            self._watch(directory)
+
+    def affected_probes(self, changed: Optional[Set[str]]) -> List[str]:
+        """Get the probes affected by changes to the given directories (None means all)."""
+        if changed is None:
+            return list(self._probe_results)
+
+        names: List[str] = []
+        for directory in changed:
+            targets = [directory] if directory in self._watch_map else []
+            # A missing directory may have been created under a watched ancestor
+            for target in self._pending.get(directory, []):
+                if os.path.isdir(target) and self._watcher.watch(target):
+                    targets.append(target)
+            if directory in self._pending:
+                self._pending[directory] = [t for t in self._pending[directory] if t not in targets]
+
+            for target in targets:
+                names.extend(name for name in self._watch_map[target] if name not in names)
+        return names
+
+    def _start_server(self):
+        """Start serving on the Unix socket in a background thread."""
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.detection_daemon = self
+        os.chmod(self.socket_path, 0o600)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def start(self):
+        """Run a full detection, start watching and start serving."""
+        self._watcher = create_watcher(self.poll_interval)
+        self._watch_all()
+        self.refresh()
+        self._start_server()
+
+    def serve_forever(self):
+        """Start, then re-probe affected tools on every change until stopped."""
+        self.start()
+        try:
+            while not self._stop.is_set():
+                changed = self._watcher.wait(1.0)
+                if changed is not None and not changed:
+                    continue
+
+                # Let installs finish touching files before re-probing
+                deadline = time.monotonic() + self.settle_time
+                while changed is not None and time.monotonic() < deadline:
+                    more = self._watcher.wait(max(deadline - time.monotonic(), 0))
+                    changed = None if more is None else changed | more
+
+                names = self.affected_probes(changed)
+                if names:
+                    self.refresh(names)
+        finally:
+            self.close()
+
+    def stop(self):
+        """Ask serve_forever to return."""
+        self._stop.set()
+
+    def close(self):
+        """Stop serving and release the socket and watches."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+
+
+def query(command: str = "get", socket_path: Optional[str] = None, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    """Ask a running detection daemon, returning None if none is reachable.
+
+    Args:
+        command: "get" for the current results, "refresh" to re-run every probe first, or "ping"
+        socket_path: Socket the daemon serves on (defaults to the per-user socket)
+        timeout: Seconds to wait for the daemon ("refresh" may need the full detection timeout)
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path or default_socket_path())
+            client.sendall(f"{command}\n".encode())
+            chunks = []
+            while True:
+                chunk = client.recv(64 * 1024)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return None
+
+
+def run_daemon(socket_path: Optional[str] = None):
+    """Run the detection daemon in the foreground until interrupted or terminated."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("The detection daemon needs Unix domain sockets, which this platform does not support.")
+        return
+
+    daemon = DetectionDaemon(socket_path=socket_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    print(f"Detection daemon serving on {daemon.socket_path}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve environment detection results over a Unix socket")
+    parser.add_argument("--socket", type=str, help="Socket path (defaults to the per-user cache directory)")
+    parser.add_argument("--query", nargs="?", const="get", choices=["get", "refresh", "ping"],
+                        help="Query a running daemon instead of starting one")
+    args = parser.parse_args()
+
+    if args.query:
+        response = query(args.query, args.socket, timeout=60.0 if args.query == "refresh" else 1.0)
+        if response is None:
+            print("No detection daemon is running.")
+            sys.exit(1)
+        print(json.dumps(response, indent=2))
+    else:
+        run_daemon(args.socket)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+detection_profile.py - Detection timing profile for Dev Environment Readyifier
+
+This script records, for every detection probe, its wall time, how many
+subprocesses it started and whether it was answered from a cache, and renders
+the result as a sorted table or JSON. Probes report subprocesses, cache hits
+and commands that timed out through note_subprocess(), note_cache_hit() and
+note_command_timeout(), which are no-ops when no profiler is measuring the
+calling probe.
+"""
+
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator
+
+_current_record: contextvars.ContextVar = contextvars.ContextVar("current_probe_record", default=None)
+
+
+class ProbeRecord:
+    """Measurements for one probe."""
+
+    def __init__(self, name: str, component: str):
+        """Initialize an empty record for a probe."""
+        self.name = name
+        self.component = component
+        self.wall_time = 0.0
+        self.subprocesses = 0
+        self.cache_hits = 0
+        self.timed_out = False
+        self.command_timed_out = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record to a JSON-serializable dict."""
+        return {
+            "name": self.name,
+            "component": self.component,
+            "wall_time_ms": round(self.wall_time * 1000, 2),
+            "subprocesses": self.subprocesses,
+            "cache_hit": self.cache_hits > 0,
+            "timed_out": self.timed_out,
+            "command_timed_out": self.command_timed_out
+        }
+
+
+def note_subprocess(count: int = 1):
+    """Record that the current probe started subprocesses."""
+    record = _current_record.get()
+    if record is not None:
+        record.subprocesses += count
+
+
+def note_cache_hit():
+    """Record that the current probe was answered from a cache."""
+    record = _current_record.get()
+    if record is not None:
+        record.cache_hits += 1
+
+
+def note_command_timeout():
+    """Record that a command the current probe ran (e.g. `code --version`) timed out."""
+    record = _current_record.get()
+    if record is not None:
+        record.command_timed_out = True
+
+
+class DetectionProfiler:
+    """Collects ProbeRecords for EnvironmentDetector and ExtensionManager probes."""
+
+    def __init__(self):
+        """Initialize the profiler."""
+        self.records: List[ProbeRecord] = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    @contextmanager
+    def measure(self, name: str, component: str) -> Iterator[ProbeRecord]:
+        """Measure the probe running inside the with block."""
+        record = ProbeRecord(name, component)
+        token = _current_record.set(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - start
+            _current_record.reset(token)
+            with self._lock:
+                self.records.append(record)
+
+    def mark_timed_out(self, names: List[str], component: str):
+        """Flag records of probes that missed their deadline."""
+        for record in self.records:
+            if record.component == component and record.name in names:
+                record.timed_out = True
+
+    def report(self) -> Dict[str, Any]:
+        """Get the profile with probes sorted slowest first."""
+        records = sorted(self.records, key=lambda record: record.wall_time, reverse=True)
+        return {
+            "total_time_ms": round((time.monotonic() - self._started) * 1000, 2),
+            "subprocesses": sum(record.subprocesses for record in records),
+            "probes": [record.to_dict() for record in records]
+        }
+
+    def format_json(self) -> str:
+        """Render the profile as JSON."""
+        return json.dumps(self.report(), indent=2)
+
+    def format_table(self) -> str:
+        """Render the profile as a table, slowest probe first."""
+        report = self.report()
+        rows = [("Probe", "Component", "Time (ms)", "Subprocs", "Cache", "Timed out")]
+        for probe in report["probes"]:
+            rows.append((
+                probe["name"],
+                probe["component"],
+                f"{probe['wall_time_ms']:.1f}",
+                str(probe["subprocesses"]),
+                "hit" if probe["cache_hit"] else "-",
+                "yes" if probe["timed_out"] else ("command" if probe["command_timed_out"] else "-")
+            ))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = []
+        for index, row in enumerate(rows):
+            lines.append("  ".join(
+                cell.rjust(width) if 2 <= i <= 3 else cell.ljust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ))
+            if index == 0:
+                lines.append("  ".join("-" * width for width in widths))
+        lines.append("")
+        lines.append(f"Total: {report['total_time_ms']:.1f} ms, {report['subprocesses']} subprocesses")
+        return "\n".join(lines)
+
+
+@contextmanager
+def measure(profiler: Optional[DetectionProfiler], name: str, component: str) -> Iterator[Optional[ProbeRecord]]:
+    """Measure a probe if a profiler is given, otherwise do nothing."""
+    if profiler is None:
+        yield None
+    else:
+        with profiler.measure(name, component) as record:
+            yield record
@@ -10,410 +10,383 @@ import os
 import sys
 import json
 import platform
-import subprocess
-from pathlib import Path
-from typing import Dict, List, Any, Optional
+import sysconfig
+import functools
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from scripts.detection_cache import DetectionCache
+    from scripts import package_metadata
+    from scripts import conda_envs
+    from scripts import vscode_extensions
+    from scripts.probe_engine import ProbeEngine
+    from scripts.subprocess_engine import ProbeRunner
+    from scripts.detection_profile import DetectionProfiler, measure, note_cache_hit
+except ImportError:
+    from detection_cache import DetectionCache
+    import package_metadata
+    import conda_envs
+    import vscode_extensions
+    from probe_engine import ProbeEngine
+    from subprocess_engine import ProbeRunner
+    from detection_profile import DetectionProfiler, measure, note_cache_hit
+
+# Declarative probe catalog, run by ProbeEngine.
+#
+#   kind           "ide" or "ai_tool": the detection results section the tool belongs to
+#   install_paths  Install locations per OS ("all" applies everywhere)
+#   cli_paths      Command-line entry points per OS, used to run the tool; "WSL"
+#                  lists Windows-side installs, probed only under WSL
+#   executables    Names looked up on PATH
+#   packages       Python distributions that provide the tool
+#   extension_ids  VS Code extensions that provide the tool, per profile
+#   version_args   Arguments that make the CLI print its version on the first line
+#
+# Paths may use {home}, {ProgramFiles}, {ProgramFiles(x86)} and {LOCALAPPDATA}, and
+# "WSL" paths {WindowsProgramFiles} and {WindowsLocalAppData} (see wsl.py).
+PROBE_CATALOG = {
+    "vscode": {
+        "kind": "ide",
+        "install_paths": {
+            "Darwin": ["/Applications/Visual Studio Code.app"],
+            "Windows": [
+                "{ProgramFiles}\\Microsoft VS Code\\Code.exe",
+                "{ProgramFiles(x86)}\\Microsoft VS Code\\Code.exe",
+                "{LOCALAPPDATA}\\Programs\\Microsoft VS Code\\Code.exe"
+            ]
+        },
+        "cli_paths": {
+            "all": ["/usr/bin/code", "/usr/local/bin/code"],
+            "Darwin": ["/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code"],
+            "WSL": [
+                "{WindowsProgramFiles}/Microsoft VS Code/bin/code",
+                "{WindowsLocalAppData}/Programs/Microsoft VS Code/bin/code"
+            ],
+            "Windows": [
+                "{ProgramFiles}\\Microsoft VS Code\\bin\\code.cmd",
+                "{LOCALAPPDATA}\\Programs\\Microsoft VS Code\\bin\\code.cmd"
+            ]
+        },
+        "executables": ["code"],
+        "version_args": ["--version"]
+    },
+    "vscode_insiders": {
+        "kind": "ide",
+        "install_paths": {
+            "Darwin": ["/Applications/Visual Studio Code - Insiders.app"],
+            "Windows": [
+                "{ProgramFiles}\\Microsoft VS Code Insiders\\Code - Insiders.exe",
+                "{ProgramFiles(x86)}\\Microsoft VS Code Insiders\\Code - Insiders.exe",
+                "{LOCALAPPDATA}\\Programs\\Microsoft VS Code Insiders\\Code - Insiders.exe"
+            ]
+        },
+        "cli_paths": {
+            "all": ["/usr/bin/code-insiders", "/usr/local/bin/code-insiders"],
+            "Darwin": ["/Applications/Visual Studio Code - Insiders.app/Contents/Resources/app/bin/code"],
+            "WSL": [
+                "{WindowsProgramFiles}/Microsoft VS Code Insiders/bin/code-insiders",
+                "{WindowsLocalAppData}/Programs/Microsoft VS Code Insiders/bin/code-insiders"
+            ],
+            "Windows": [
+                "{ProgramFiles}\\Microsoft VS Code Insiders\\bin\\code-insiders.cmd",
+                "{LOCALAPPDATA}\\Programs\\Microsoft VS Code Insiders\\bin\\code-insiders.cmd"
+            ]
+        },
+        "executables": ["code-insiders"],
+        "version_args": ["--version"]
+    },
+    "trae": {
+        "kind": "ide",
+        "install_paths": {
+            "Darwin": ["/Applications/Trae.app"],
+            "Linux": ["/usr/bin/trae", "/usr/local/bin/trae", "{home}/.local/bin/trae"],
+            "Windows": [
+                "{ProgramFiles}\\Trae\\Trae.exe",
+                "{ProgramFiles(x86)}\\Trae\\Trae.exe",
+                "{LOCALAPPDATA}\\Programs\\Trae\\Trae.exe"
+            ]
+        },
+        "cli_paths": {
+            "all": ["/usr/bin/trae", "/usr/local/bin/trae"],
+            "Darwin": ["/Applications/Trae.app/Contents/Resources/app/bin/trae"],
+            "WSL": [
+                "{WindowsProgramFiles}/Trae/bin/trae",
+                "{WindowsLocalAppData}/Programs/Trae/bin/trae"
+            ]
+        },
+        "executables": ["trae"]
+    },
+    "void": {
+        "kind": "ide",
+        "install_paths": {
+            "Darwin": ["/Applications/VOID.app"],
+            "Linux": ["/usr/bin/void", "/usr/local/bin/void", "{home}/.local/bin/void"],
+            "Windows": [
+                "{ProgramFiles}\\VOID\\VOID.exe",
+                "{ProgramFiles(x86)}\\VOID\\VOID.exe",
+                "{LOCALAPPDATA}\\Programs\\VOID\\VOID.exe"
+            ]
+        },
+        "cli_paths": {
+            "all": ["/usr/bin/void", "/usr/local/bin/void"],
+            "Darwin": ["/Applications/VOID.app/Contents/Resources/app/bin/void"],
+            "WSL": [
+                "{WindowsProgramFiles}/VOID/bin/void",
+                "{WindowsLocalAppData}/Programs/VOID/bin/void"
+            ]
+        },
+        "executables": ["void"]
+    },
+    "cline": {
+        "kind": "ai_tool",
+        "packages": ["cline"],
+        "extension_ids": {"vscode": ["Cline.cline"]}
+    },
+    "roo": {
+        "kind": "ai_tool",
+        "install_paths": {
+            "Darwin": ["/Applications/Roo.app"],
+            "Linux": ["/usr/bin/roo", "/usr/local/bin/roo", "{home}/.local/bin/roo"],
+            "Windows": [
+                "{ProgramFiles}\\Roo\\Roo.exe",
+                "{ProgramFiles(x86)}\\Roo\\Roo.exe",
+                "{LOCALAPPDATA}\\Programs\\Roo\\Roo.exe"
+            ]
+        },
+        "extension_ids": {"vscode": ["RooCode.roocode"]}
+    },
+    "aider": {
+        "kind": "ai_tool",
+        "packages": ["aider-chat"],
+        "executables": ["aider"],
+        "version_args": ["--version"]
+    }
+}
 
 class EnvironmentDetector:
     """Detects installed development environments, tools, and extensions."""
     
-    def __init__(self):
-        """Initialize the environment detector."""
+    def __init__(
+        self,
+        max_workers: int = 8,
+        probe_timeout: float = 15.0,
+        detection_timeout: float = 30.0,
+        cache: Optional[DetectionCache] = None,
+        profiler: Optional[DetectionProfiler] = None
+    ):
+        """Initialize the environment detector.
+        
+        Args:
+            max_workers: Maximum number of threads for probes that are not async
+            probe_timeout: Seconds each probe may take before it is cancelled
+            detection_timeout: Seconds the whole detection may take; probes still
+                running at this deadline are cancelled and their defaults used
+            cache: Detection cache to use (defaults to the per-user cache file)
+            profiler: Profiler recording each probe's time, subprocesses and cache use
+        """
         self.os_type = platform.system()
         self.os_release = platform.release()
         self.python_version = platform.python_version()
+        self.max_workers = max_workers
+        self.probe_timeout = probe_timeout
+        self.detection_timeout = detection_timeout
+        self.cache = cache or DetectionCache()
+        self.profiler = profiler
+    
+    def detect_environments(self, refresh: bool = False) -> Dict[str, Any]:
+        """Detect all installed development environments and tools.
+        
+        Results are served from the on-disk cache when the environment
+        fingerprint is unchanged, unless refresh is set. Probes that miss their
+        deadline are listed in "timed_out_probes"; such partial results are
+        returned but not cached.
+        """
+        engine = ProbeEngine(PROBE_CATALOG, self.os_type, self.probe_timeout)
+        with measure(self.profiler, "detection_cache", "detector"):
+            fingerprint = self.cache.fingerprint(self._fingerprint_paths(engine))
+            cached = None if refresh else self.cache.load(fingerprint)
+            if cached is not None:
+                note_cache_hit()
+        if cached is not None:
+            return cached
+        
+        results = self._detect_uncached(engine)
+        if not results["timed_out_probes"]:
+            self.cache.save(fingerprint, results)
+        return results
+    
+    def _fingerprint_paths(self, engine: ProbeEngine) -> List[str]:
+        """Get the binaries and directories whose mtimes decide whether cached results are stale."""
+        paths = [p for p in os.environ.get("PATH", "").split(os.pathsep) if p]
+        
+        # Package installs (cline, aider) touch the interpreter's site-packages
+        paths.extend(sysconfig.get_paths()[key] for key in ("purelib", "platlib"))
+        
+        # VS Code extension folders (as the extension probe finds them) and the conda environment registry
+        for profile in vscode_extensions.PROFILES:
+            directory = vscode_extensions.extensions_dir(profile)
+            paths.extend([directory, os.path.join(directory, "extensions.json")])
+        paths.append(conda_envs.registry_path())
+        
+        # Conda, mamba and micromamba roots and their envs/ directories
+        for root in conda_envs.candidate_roots():
+            paths.extend([root, os.path.join(root, "envs")])
+        
+        # Install locations and CLIs from the probe catalog
+        paths.extend(engine.fingerprint_paths())
+        
+        return paths
+    
+    def watch_paths(self, engine: ProbeEngine) -> Dict[str, List[str]]:
+        """Get the directories whose contents each probe depends on.
+        
+        Returns:
+            Mapping of directory to the names of the probes a change there affects
+        """
+        watched: Dict[str, List[str]] = {}
+        
+        def add(directory: str, names: List[str]):
+            probes = watched.setdefault(os.path.normpath(directory), [])
+            probes.extend(name for name in names if name not in probes)
+        
+        # Executables on PATH and packages in site-packages
+        on_path = [tool for tool, spec in PROBE_CATALOG.items() if spec.get("executables")]
+        for directory in os.environ.get("PATH", "").split(os.pathsep):
+            if directory:
+                add(directory, on_path)
+        packaged = [tool for tool, spec in PROBE_CATALOG.items() if spec.get("packages")]
+        for key in ("purelib", "platlib"):
+            add(sysconfig.get_paths()[key], packaged)
+        
+        # Directories holding each tool's install locations and CLIs
+        for tool in PROBE_CATALOG:
+            for path in engine.concrete_paths(tool):
+                add(os.path.dirname(path), [tool])
+        
+        # Extension folders (VSCODE_EXTENSIONS overrides the default one)
+        add(vscode_extensions.extensions_dir("vscode"), ["vscode_extensions"])
+        for tool, spec in PROBE_CATALOG.items():
+            for profile in spec.get("extension_ids", {}):
+                add(vscode_extensions.extensions_dir(profile), [tool])
+        
+        add(os.path.dirname(conda_envs.registry_path()), ["conda_environments"])
+        for root in conda_envs.candidate_roots():
+            add(root, ["conda_environments"])
+            add(os.path.join(root, "envs"), ["conda_environments"])
+        
+        return watched
+    
+    def run_probes(
+        self,
+        engine: ProbeEngine,
+        names: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Run probes concurrently, returning (probe results, names of probes that timed out).
+        
+        Args:
+            engine: Probe engine to run catalog probes with
+            names: Probes to run (defaults to all of them: every catalog tool,
+                "conda_environments" and "vscode_extensions")
+        """
+        probes = {
+            "conda_environments": (self._detect_conda_environments, []),
+            "vscode_extensions": (lambda: self._detect_vscode_extensions(engine, "vscode"), [])
+        }
+        for tool in PROBE_CATALOG:
+            probes[tool] = (functools.partial(engine.probe_async, tool), None)
+        if names is not None:
+            probes = {name: probe for name, probe in probes.items() if name in names}
+        
+        runner = ProbeRunner(self.probe_timeout, self.detection_timeout, self.max_workers, self.profiler)
+        return runner.run(probes)
+    
+    def _detect_uncached(self, engine: ProbeEngine) -> Dict[str, Any]:
+        """Run every probe and assemble the detection results."""
+        # Every probe is independent, so run them all at once
+        probe_results, timed_out = self.run_probes(engine)
+        return self.assemble_results(probe_results, timed_out)
     
-    def detect_environments(self) -> Dict[str, Any]:
-        """Detect all installed development environments and tools."""
+    def assemble_results(self, probe_results: Dict[str, Any], timed_out: List[str]) -> Dict[str, Any]:
+        """Build detection results from the results of every probe."""
         results = {
             "os_info": {
+                "hostname": platform.node(),
                 "system": self.os_type,
                 "release": self.os_release,
                 "python_version": self.python_version
             },
             "ides": {},
             "ai_tools": {},
-            "conda_environments": self._detect_conda_environments(),
-            "vscode_extensions": []
+            "conda_environments": probe_results["conda_environments"],
+            "vscode_extensions": [],
+            "timed_out_probes": timed_out
         }
         
-        # Detect IDEs
-        vscode_path = self._detect_vscode()
-        if vscode_path:
-            results["ides"]["vscode"] = {
-                "version": self._get_vscode_version("vscode"),
-                "path": vscode_path
-            }
-            results["vscode_extensions"] = self._detect_vscode_extensions("vscode")
-        
-        vscode_insiders_path = self._detect_vscode_insiders()
-        if vscode_insiders_path:
-            results["ides"]["vscode_insiders"] = {
-                "version": self._get_vscode_version("vscode_insiders"),
-                "path": vscode_insiders_path
-            }
-        
-        trae_path = self._detect_trae()
-        if trae_path:
-            results["ides"]["trae"] = {
-                "version": "Unknown",  # Would need specific version detection
-                "path": trae_path
-            }
+        sections = {"ide": "ides", "ai_tool": "ai_tools"}
+        for tool, spec in PROBE_CATALOG.items():
+            if probe_results[tool]:
+                results[sections[spec["kind"]]][tool] = probe_results[tool]
         
-        void_path = self._detect_void()
-        if void_path:
-            results["ides"]["void"] = {
-                "version": "Unknown",  # Would need specific version detection
-                "path": void_path
-            }
+        # Extensions are only reported when VS Code itself was found
+        if "vscode" in results["ides"]:
+            results["vscode_extensions"] = probe_results["vscode_extensions"]
         
-        # Detect AI tools
-        cline_path = self._detect_cline()
-        if cline_path:
-            results["ai_tools"]["cline"] = {
-                "version": self._get_tool_version("cline"),
-                "path": cline_path
-            }
+        return results
+    
+    def detect_conda_packages(
+        self,
+        environments: List[Dict[str, str]],
+        packages: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Optional[str]]]:
+        """Get installed package versions in each Conda environment.
         
-        roo_path = self._detect_roo()
-        if roo_path:
-            results["ai_tools"]["roo"] = {
-                "version": "Unknown",  # Would need specific version detection
-                "path": roo_path
-            }
+        Runs one helper process per environment interpreter, covering every
+        package at once, instead of one `pip show` per package.
         
-        aider_path = self._detect_aider()
-        if aider_path:
-            results["ai_tools"]["aider"] = {
-                "version": self._get_tool_version("aider"),
-                "path": aider_path
-            }
+        Args:
+            environments: Conda environments as returned in "conda_environments"
+            packages: Distribution names to look up (defaults to the catalog's packages)
+        """
+        packages = packages or sorted({name for spec in PROBE_CATALOG.values() for name in spec.get("packages", [])})
+        interpreters = {}
+        for env in environments:
+            python = package_metadata.interpreter_for_prefix(env["path"])
+            if python:
+                interpreters[python] = env["name"]
         
-        return results
-    
-    def _detect_vscode(self) -> Optional[str]:
-        """Detect if Visual Studio Code is installed."""
-        try:
-            if self.os_type == "Darwin":  # macOS
-                app_path = "/Applications/Visual Studio Code.app"
-                if os.path.exists(app_path):
-                    return app_path
-                
-                # Check if installed via Homebrew
-                result = subprocess.run(
-                    "which code", 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip()
-            elif self.os_type == "Linux":
-                result = subprocess.run(
-                    "which code", 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip()
-            elif self.os_type == "Windows":
-                # Check common installation paths
-                paths = [
-                    os.path.join(os.environ.get("ProgramFiles", "C:\\Program Files"), "Microsoft VS Code", "Code.exe"),
-                    os.path.join(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"), "Microsoft VS Code", "Code.exe"),
-                    os.path.join(os.environ.get("LOCALAPPDATA", "C:\\Users\\User\\AppData\\Local"), "Programs", "Microsoft VS Code", "Code.exe")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            
-            return None
-        except Exception:
-            return None
-    
-    def _detect_vscode_insiders(self) -> Optional[str]:
-        """Detect if Visual Studio Code Insiders is installed."""
-        try:
-            if self.os_type == "Darwin":  # macOS
-                app_path = "/Applications/Visual Studio Code - Insiders.app"
-                if os.path.exists(app_path):
-                    return app_path
-                
-                # Check if installed via Homebrew
-                result = subprocess.run(
-                    "which code-insiders", 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip()
-            elif self.os_type == "Linux":
-                result = subprocess.run(
-                    "which code-insiders", 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip()
-            elif self.os_type == "Windows":
-                # Check common installation paths
-                paths = [
-                    os.path.join(os.environ.get("ProgramFiles", "C:\\Program Files"), "Microsoft VS Code Insiders", "Code - Insiders.exe"),
-                    os.path.join(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"), "Microsoft VS Code Insiders", "Code - Insiders.exe"),
-                    os.path.join(os.environ.get("LOCALAPPDATA", "C:\\Users\\User\\AppData\\Local"), "Programs", "Microsoft VS Code Insiders", "Code - Insiders.exe")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            
-            return None
-        except Exception:
-            return None
-    
-    def _detect_trae(self) -> Optional[str]:
-        """Detect if Trae IDE is installed."""
-        try:
-            if self.os_type == "Darwin":  # macOS
-                app_path = "/Applications/Trae.app"
-                if os.path.exists(app_path):
-                    return app_path
-            elif self.os_type == "Linux":
-                # Check common installation paths
-                paths = [
-                    "/usr/bin/trae",
-                    "/usr/local/bin/trae",
-                    os.path.join(str(Path.home()), ".local", "bin", "trae")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            elif self.os_type == "Windows":
-                # Check common installation paths
-                paths = [
-                    os.path.join(os.environ.get("ProgramFiles", "C:\\Program Files"), "Trae", "Trae.exe"),
-                    os.path.join(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"), "Trae", "Trae.exe"),
-                    os.path.join(os.environ.get("LOCALAPPDATA", "C:\\Users\\User\\AppData\\Local"), "Programs", "Trae", "Trae.exe")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            
-            return None
-        except Exception:
-            return None
-    
-    def _detect_void(self) -> Optional[str]:
-        """Detect if VOID IDE is installed."""
-        try:
-            if self.os_type == "Darwin":  # macOS
-                app_path = "/Applications/VOID.app"
-                if os.path.exists(app_path):
-                    return app_path
-            elif self.os_type == "Linux":
-                # Check common installation paths
-                paths = [
-                    "/usr/bin/void",
-                    "/usr/local/bin/void",
-                    os.path.join(str(Path.home()), ".local", "bin", "void")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            elif self.os_type == "Windows":
-                # Check common installation paths
-                paths = [
-                    os.path.join(os.environ.get("ProgramFiles", "C:\\Program Files"), "VOID", "VOID.exe"),
-                    os.path.join(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"), "VOID", "VOID.exe"),
-                    os.path.join(os.environ.get("LOCALAPPDATA", "C:\\Users\\User\\AppData\\Local"), "Programs", "VOID", "VOID.exe")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            
-            return None
-        except Exception:
-            return None
-    
-    def _detect_cline(self) -> Optional[str]:
-        """Detect if Cline is installed."""
-        try:
-            result = subprocess.run(
-                "pip show cline", 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.returncode == 0:
-                return "pip:cline"
-            
-            return None
-        except Exception:
-            return None
-    
-    def _detect_roo(self) -> Optional[str]:
-        """Detect if Roo Code is installed."""
-        try:
-            if self.os_type == "Darwin":  # macOS
-                app_path = "/Applications/Roo.app"
-                if os.path.exists(app_path):
-                    return app_path
-            elif self.os_type == "Linux":
-                # Check common installation paths
-                paths = [
-                    "/usr/bin/roo",
-                    "/usr/local/bin/roo",
-                    os.path.join(str(Path.home()), ".local", "bin", "roo")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            elif self.os_type == "Windows":
-                # Check common installation paths
-                paths = [
-                    os.path.join(os.environ.get("ProgramFiles", "C:\\Program Files"), "Roo", "Roo.exe"),
-                    os.path.join(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"), "Roo", "Roo.exe"),
-                    os.path.join(os.environ.get("LOCALAPPDATA", "C:\\Users\\User\\AppData\\Local"), "Programs", "Roo", "Roo.exe")
-                ]
-                for path in paths:
-                    if os.path.exists(path):
-                        return path
-            
-            return None
-        except Exception:
-            return None
-    
-    def _detect_aider(self) -> Optional[str]:
-        """Detect if Aider is installed."""
-        try:
-            result = subprocess.run(
-                "pip show aider-chat", 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.returncode == 0:
-                return "pip:aider-chat"
-            
-            return None
-        except Exception:
-            return None
-    
-    def _get_vscode_version(self, tool: str) -> str:
-        """Get the version of Visual Studio Code or VS Code Insiders."""
-        try:
-            cmd = "code --version" if tool == "vscode" else "code-insiders --version"
-            result = subprocess.run(
-                cmd, 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.returncode == 0:
-                # First line of output is the version
-                return result.stdout.strip().split("\n")[0]
-            
-            return "Unknown"
-        except Exception:
-            return "Unknown"
-    
-    def _get_tool_version(self, tool: str) -> str:
-        """Get the version of a tool."""
-        try:
-            cmd = f"pip show {tool}"
-            result = subprocess.run(
-                cmd, 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.returncode == 0:
-                # Extract version from pip show output
-                for line in result.stdout.strip().split("\n"):
-                    if line.startswith("Version:"):
-                        return line.split("Version:")[1].strip()
-            
-            return "Unknown"
-        except Exception:
-            return "Unknown"
+        results = package_metadata.query_interpreters(list(interpreters), packages, timeout=self.probe_timeout)
+        return {interpreters[python]: versions for python, versions in results.items()}
     
     def _detect_conda_environments(self) -> List[Dict[str, str]]:
         """Detect Conda environments."""
-        environments = []
-        
         try:
-            # Check if conda is installed
-            result = subprocess.run(
-                "conda info --envs --json", 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                try:
-                    conda_info = json.loads(result.stdout)
-                    for env in conda_info.get("envs", []):
-                        env_name = os.path.basename(env)
-                        environments.append({
-                            "name": env_name,
-                            "path": env
-                        })
-                except json.JSONDecodeError:
-                    pass
+            return conda_envs.find_environments(timeout=self.probe_timeout)
         except Exception:
-            pass
-        
-        return environments
+            return []
     
-    def _detect_vscode_extensions(self, tool: str) -> List[Dict[str, str]]:
+    def _detect_vscode_extensions(self, engine: ProbeEngine, tool: str) -> List[Dict[str, str]]:
         """Detect installed VS Code extensions."""
-        extensions = []
-        
         try:
-            cmd = "code --list-extensions --show-versions" if tool == "vscode" else "code-insiders --list-extensions --show-versions"
-            result = subprocess.run(
-                cmd, 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.strip().split("\n"):
-                    if line:
-                        parts = line.split("@")
-                        if len(parts) == 2:
-                            extensions.append({
-                                "id": parts[0],
-                                "version": parts[1],
-                                "name": parts[0].split(".")[-1]
-                            })
-                        else:
-                            extensions.append({
-                                "id": line,
-                                "version": "Unknown",
-                                "name": line.split(".")[-1]
-                            })
+            return [
+                {"id": ext["id"], "version": ext["version"], "name": ext["name"]}
+                for ext in engine.installed_extensions(tool)
+            ]
         except Exception:
-            pass
-        
-        return extensions
+            return []
 
 if __name__ == "__main__":
     # For testing purposes
-    detector = EnvironmentDetector()
-    results = detector.detect_environments()
-    print(json.dumps(results, indent=2))
+    import argparse
+    parser = argparse.ArgumentParser(description="Detect installed development environments")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached detection results")
+    parser.add_argument("--profile-detection", nargs="?", const="table", choices=["table", "json"],
+                        help="Print how long each probe took instead of the results")
+    args = parser.parse_args()
+    
+    profiler = DetectionProfiler() if args.profile_detection else None
+    detector = EnvironmentDetector(profiler=profiler)
+    results = detector.detect_environments(refresh=args.refresh)
+    if profiler:
+        print(profiler.format_json() if args.profile_detection == "json" else profiler.format_table())
+    else:
+        print(json.dumps(results, indent=2))
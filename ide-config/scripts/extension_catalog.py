@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+extension_catalog.py - Unified extension catalog for Dev Environment Readyifier
+
+This script compiles the recommended extensions (templates/recommended_extensions.json,
+grouped by IDE and category) and the GUI recommendations (data/gui_ready_data.json,
+grouped by category only) into one normalized catalog indexed by extension ID,
+category and IDE. IDs are validated and normalized on the way in (stray
+whitespace and trailing dots are removed; entries that are not a
+`publisher.name` marketplace ID are reported and left out).
+
+The compiled catalog is pickled in the per-user cache directory together with
+the modification time and size of every source, so later runs load it without
+parsing any JSON until a source changes.
+"""
+
+import os
+import re
+import sys
+import json
+import pickle
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from scripts.detection_cache import default_cache_dir
+except ImportError:
+    from detection_cache import default_cache_dir
+
+CATALOG_FORMAT_VERSION = 1
+
+# Marketplace IDs are publisher.name
+_EXTENSION_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9-]*\.[A-Za-z0-9][A-Za-z0-9._-]*$")
+_VERSION = re.compile(r"^\d+(\.\d+)*([-.][0-9A-Za-z.-]+)?$")
+
+# Fields of a recommended entry that take a version
+VERSION_FIELDS = ("version", "min_version")
+
+
+def default_gui_data_path(recommended_path: str) -> str:
+    """Get the GUI data file that sits next to a recommended extensions template."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(recommended_path)))
+    return os.path.join(base_dir, "data", "gui_ready_data.json")
+
+
+def normalize_id(raw: Any) -> Optional[str]:
+    """Get a marketplace ID without stray whitespace or trailing dots, or None if it is not one."""
+    if not isinstance(raw, str):
+        return None
+    ext_id = raw.strip().rstrip(".")
+    return ext_id if _EXTENSION_ID.match(ext_id) else None
+
+
+def _source_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Get a source file's modification time and size, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_json(path: str) -> Any:
+    """Parse a catalog source."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _normalize_entry(raw: Dict[str, Any], where: str, problems: List[str]) -> Optional[Dict[str, Any]]:
+    """Validate one extension entry, returning a normalized copy or None if it is unusable."""
+    ext_id = normalize_id(raw.get("id"))
+    if ext_id is None:
+        problems.append(f"{where}: invalid extension ID {raw.get('id')!r}")
+        return None
+    if ext_id != raw["id"]:
+        problems.append(f"{where}: normalized extension ID {raw['id']!r} to {ext_id!r}")
+
+    entry = dict(raw, id=ext_id)
+    entry.setdefault("name", ext_id)
+    if "install_command" in entry:
+        entry["install_command"] = entry["install_command"].strip().rstrip(".")
+    for field in VERSION_FIELDS:
+        if field in entry and not (isinstance(entry[field], str) and _VERSION.match(entry[field])):
+            problems.append(f"{where}: {ext_id} has an invalid {field} {entry[field]!r}")
+            del entry[field]
+    return entry
+
+
+def compile_catalog(recommended_path: str, gui_data_path: Optional[str] = None) -> Dict[str, Any]:
+    """Compile the catalog from its sources.
+
+    Args:
+        recommended_path: Recommended extensions template, grouped by IDE and category
+        gui_data_path: GUI data file (defaults to data/gui_ready_data.json next to the template)
+
+    Returns:
+        The compiled catalog: per-IDE recommendations ("environments"), CLI
+        tools, every extension by lowercased ID, the category and IDE indexes,
+        and the problems found while validating
+    """
+    gui_data_path = gui_data_path or default_gui_data_path(recommended_path)
+    problems: List[str] = []
+    environments: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    extensions: Dict[str, Dict[str, Any]] = {}
+    by_category: Dict[str, List[str]] = {}
+    by_ide: Dict[str, List[str]] = {}
+
+    def index(entry: Dict[str, Any], category: str, ide: Optional[str]):
+        key = entry["id"].lower()
+        merged = extensions.setdefault(key, dict(entry, categories=[], ides=[]))
+        # The first source to describe an extension wins; later ones fill gaps
+        for field, value in entry.items():
+            merged.setdefault(field, value)
+        if category not in merged["categories"]:
+            merged["categories"].append(category)
+            by_category.setdefault(category, []).append(key)
+        if ide and ide not in merged["ides"]:
+            merged["ides"].append(ide)
+            by_ide.setdefault(ide, []).append(key)
+
+    recommended = _read_json(recommended_path)
+    cli_tools = recommended.get("cli_tools", {})
+    for env_name, categories in recommended.items():
+        if env_name == "cli_tools":
+            continue
+        for category, raw_entries in categories.items():
+            seen = set()
+            for raw in raw_entries:
+                entry = _normalize_entry(raw, f"{env_name}/{category}", problems)
+                if entry is None or entry["id"].lower() in seen:
+                    continue
+                seen.add(entry["id"].lower())
+                environments.setdefault(env_name, {}).setdefault(category, []).append(entry)
+                index(entry, category, env_name)
+
+    if os.path.exists(gui_data_path):
+        gui_data = _read_json(gui_data_path)
+        groups = gui_data.get("categories", {}).get("extensions", {}).get("groups", {})
+        for group, data in groups.items():
+            for raw in data.get("items", []):
+                entry = _normalize_entry(raw, f"gui_ready_data/{group}", problems)
+                if entry is not None:
+                    # GUI recommendations do not name a target IDE
+                    entry.pop("category", None)
+                    index(entry, group, None)
+
+    return {
+        "format": CATALOG_FORMAT_VERSION,
+        "environments": environments,
+        "cli_tools": cli_tools,
+        "extensions": extensions,
+        "by_category": by_category,
+        "by_ide": by_ide,
+        "problems": problems
+    }
+
+
+class ExtensionCatalog:
+    """Lookups over a compiled extension catalog."""
+
+    def __init__(self, compiled: Dict[str, Any]):
+        """Initialize the catalog from compile_catalog's result."""
+        self.compiled = compiled
+
+    @property
+    def environments(self) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Get the recommended extensions per IDE and category, plus "cli_tools"."""
+        return dict(self.compiled["environments"], cli_tools=self.compiled["cli_tools"])
+
+    @property
+    def problems(self) -> List[str]:
+        """Get the problems found while compiling."""
+        return self.compiled["problems"]
+
+    def get(self, ext_id: str) -> Optional[Dict[str, Any]]:
+        """Get an extension by ID, case-insensitively."""
+        normalized = normalize_id(ext_id)
+        return self.compiled["extensions"].get(normalized.lower()) if normalized else None
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Get the extensions in a category."""
+        return [self.compiled["extensions"][key] for key in self.compiled["by_category"].get(category, [])]
+
+    def by_ide(self, ide: str) -> List[Dict[str, Any]]:
+        """Get the extensions recommended for an IDE (e.g. "vscode")."""
+        return [self.compiled["extensions"][key] for key in self.compiled["by_ide"].get(ide, [])]
+
+    def categories(self) -> List[str]:
+        """Get every category."""
+        return list(self.compiled["by_category"])
+
+    def ides(self) -> List[str]:
+        """Get every IDE with recommendations."""
+        return list(self.compiled["by_ide"])
+
+
+def _cache_path(sources: List[str]) -> str:
+    """Get the compiled cache file for a set of sources."""
+    digest = hashlib.sha256("\0".join(sources).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(default_cache_dir(), f"catalog-{digest}.pickle")
+
+
+def load_catalog(recommended_path: str, gui_data_path: Optional[str] = None,
+                 cache_path: Optional[str] = None) -> ExtensionCatalog:
+    """Load the catalog, from the compiled cache when no source has changed.
+
+    Raises:
+        OSError, ValueError: If the recommended extensions template cannot be read or parsed
+    """
+    sources = [os.path.abspath(recommended_path), os.path.abspath(gui_data_path or default_gui_data_path(recommended_path))]
+    stamps = {path: _source_stamp(path) for path in sources}
+    cache_path = cache_path or _cache_path(sources)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get("format") == CATALOG_FORMAT_VERSION and cached.get("sources") == stamps:
+            return ExtensionCatalog(cached["catalog"])
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        pass
+
+    compiled = compile_catalog(sources[0], sources[1])
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"format": CATALOG_FORMAT_VERSION, "sources": stamps, "catalog": compiled},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return ExtensionCatalog(compiled)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    import argparse
+    default_template = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "templates",
+                                    "recommended_extensions.json")
+    parser = argparse.ArgumentParser(description="Validate and query the extension catalog")
+    parser.add_argument("--template", default=default_template, help="Recommended extensions template")
+    parser.add_argument("--gui-data", help="GUI data file (defaults to data/gui_ready_data.json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("check", help="Compile the catalog and report invalid or normalized entries")
+    show_parser = commands.add_parser("show", help="Show one extension")
+    show_parser.add_argument("extension_id")
+    category_parser = commands.add_parser("category", help="List the extensions in a category")
+    category_parser.add_argument("category")
+    ide_parser = commands.add_parser("ide", help="List the extensions recommended for an IDE")
+    ide_parser.add_argument("ide")
+
+    args = parser.parse_args(argv)
+    if args.command == "check":
+        catalog = ExtensionCatalog(compile_catalog(args.template, args.gui_data))
+        for problem in catalog.problems:
+            print(problem)
+        print(f"{len(catalog.compiled['extensions'])} extensions, {len(catalog.problems)} problems")
+        return
+
+    catalog = load_catalog(args.template, args.gui_data)
+    if args.command == "show":
+        entry = catalog.get(args.extension_id)
+        if entry is None:
+            print(f"Unknown extension: {args.extension_id}")
+            sys.exit(1)
+        print(json.dumps(entry, indent=2))
+    elif args.command == "category":
+        for entry in catalog.by_category(args.category):
+            print(f"{entry['id']}\t{entry['name']}")
+    elif args.command == "ide":
+        for entry in catalog.by_ide(args.ide):
+            print(f"{entry['id']}\t{entry['name']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+extension_graph.py - Extension pack and dependency resolution for Dev Environment Readyifier
+
+This script builds a graph from the `extensionPack` and `extensionDependencies`
+fields of VS Code extension manifests (installed extensions and packages in the
+local VSIX store) and reduces a list of extensions to install to its minimal
+root set: extensions that another requested extension brings in as a side
+effect are left out of the `--install-extension` call.
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+
+def bundled_ids(manifest: Dict[str, Any]) -> List[str]:
+    """Get the lowercased IDs a manifest's extensionPack and extensionDependencies install with it."""
+    bundled = []
+    for field in ("extensionPack", "extensionDependencies"):
+        for ext_id in manifest.get(field) or []:
+            if isinstance(ext_id, str) and ext_id.strip().lower() not in bundled:
+                bundled.append(ext_id.strip().lower())
+    return bundled
+
+
+def build_graph(*sources: Dict[str, Iterable[str]]) -> Dict[str, Set[str]]:
+    """Merge {extension ID: bundled IDs} mappings into one graph keyed by lowercased ID."""
+    graph: Dict[str, Set[str]] = {}
+    for source in sources:
+        for ext_id, bundled in source.items():
+            graph.setdefault(ext_id.lower(), set()).update(item.lower() for item in bundled)
+    return graph
+
+
+def reachable(graph: Dict[str, Set[str]], ext_id: str) -> Set[str]:
+    """Get every extension installing ext_id brings in, directly or through nested packs."""
+    seen: Set[str] = set()
+    stack = list(graph.get(ext_id.lower(), ()))
+    while stack:
+        current = stack.pop()
+        if current not in seen:
+            seen.add(current)
+            stack.extend(graph.get(current, ()))
+    seen.discard(ext_id.lower())
+    return seen
+
+
+def minimal_roots(requested: List[str], graph: Dict[str, Set[str]],
+                  candidates: Optional[Iterable[str]] = None) -> Tuple[List[str], Dict[str, str]]:
+    """Reduce requested extensions to those no other requested extension installs.
+
+    Args:
+        requested: Extension IDs to install, in order
+        graph: Graph from build_graph
+        candidates: IDs that may be left out (defaults to all requested); others are always roots
+
+    Returns:
+        (roots, covered): the IDs to install, in requested order, and
+        {left-out ID: root that installs it}. In a cycle the first requested
+        extension is kept.
+    """
+    candidates = {ext_id.lower() for ext_id in (requested if candidates is None else candidates)}
+    reach = {ext_id: reachable(graph, ext_id) for ext_id in requested}
+
+    roots: List[str] = []
+    for ext_id in requested:
+        key = ext_id.lower()
+        if key in candidates and any(key in reach[root] for root in roots):
+            continue
+        # A later pack can cover roots chosen before it
+        roots = [root for root in roots if root.lower() not in candidates or root.lower() not in reach[ext_id]]
+        roots.append(ext_id)
+
+    covered = {}
+    for ext_id in requested:
+        if ext_id not in roots:
+            covered[ext_id] = next(root for root in roots if ext_id.lower() in reach[root])
+    return roots, covered
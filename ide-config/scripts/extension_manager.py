@@ -11,273 +11,261 @@ import json
 import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from scripts import vscode_extensions, extension_graph
+    from scripts.detector import PROBE_CATALOG
+    from scripts.probe_engine import ProbeEngine
+    from scripts.detection_profile import measure, note_cache_hit
+    from scripts.vsix_cache import VsixCache, version_key, is_numeric_version
+    from scripts.install_journal import InstallJournal
+    from scripts.extension_catalog import load_catalog
+    from scripts.install_progress import ProgressReporter, stream_events
+except ImportError:
+    import vscode_extensions
+    import extension_graph
+    from detector import PROBE_CATALOG
+    from probe_engine import ProbeEngine
+    from detection_profile import measure, note_cache_hit
+    from vsix_cache import VsixCache, version_key, is_numeric_version
+    from install_journal import InstallJournal
+    from extension_catalog import load_catalog
+    from install_progress import ProgressReporter, stream_events
+
 class ExtensionManager:
     """Manages extension detection and installation for various development environments."""
     
-    def __init__(self, config_path):
-        """Initialize the extension manager with the path to the extension configuration."""
+    def __init__(self, config_path, profiler=None, max_workers=4, vsix_cache=None, offline=False, journal=None,
+                 reconcile_journal=None):
+        """Initialize the extension manager with the path to the extension configuration.
+        
+        An optional DetectionProfiler records how long each detection takes.
+        max_workers limits how many install targets (IDE profiles, pip
+        installers) are installed into at the same time. Extensions held in
+        vsix_cache (defaults to the per-user VSIX store) are installed from
+        it; with offline set, other extensions are not downloaded. Install
+        steps are recorded in journal, and reconcile runs in reconcile_journal,
+        so the two can be interrupted and resumed independently (both default
+        to per-user journals).
+        """
         self.config_path = config_path
+        self.profiler = profiler
+        self.max_workers = max_workers
+        self.vsix_cache = vsix_cache or VsixCache()
+        self.offline = offline
+        self.journal = journal or InstallJournal("extensions")
+        self.reconcile_journal = reconcile_journal or InstallJournal("reconcile")
         self.extensions = self._load_extensions()
+        self.recommended_index = self._index_recommended(self.extensions)
         self.installed_extensions = {}
         self.missing_extensions = {}
+        self.outdated_extensions = {}
+        self.engine = ProbeEngine(PROBE_CATALOG)
+        # Discovery results, kept until invalidate() is called
+        self._discovered = {}
+        # One lock per install target, so installs into the same target never overlap
+        self._target_locks = {}
+        self._target_locks_lock = threading.Lock()
+    
+    def _discover(self, key, lookup):
+        """Run a discovery lookup once per instance and remember its result."""
+        if key in self._discovered:
+            note_cache_hit()
+        else:
+            self._discovered[key] = lookup()
+        return self._discovered[key]
+    
+    def invalidate(self):
+        """Forget discovery results so the next lookups see what was just installed."""
+        self._discovered.clear()
+        self.engine.clear_memo()
     
     def _load_extensions(self):
-        """Load the recommended extensions from the JSON configuration file."""
+        """Load the recommended extensions from the compiled extension catalog."""
         try:
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            return load_catalog(self.config_path).environments
+        except (OSError, json.JSONDecodeError) as e:
             print(f"Error loading extensions configuration: {e}")
             return {}
     
-    def detect_vscode(self):
-        """Detect if VSCode is installed and return the path."""
-        # Check common installation paths
-        paths = [
-            # Linux
-            "/usr/bin/code",
-            "/usr/local/bin/code",
-            # macOS
-            "/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code",
-            # Windows (via WSL)
-            "/mnt/c/Program Files/Microsoft VS Code/bin/code",
-            "/mnt/c/Users/*/AppData/Local/Programs/Microsoft VS Code/bin/code"
-        ]
+    @staticmethod
+    def _index_recommended(extensions):
+        """Index recommended extensions per environment as [(normalized id, category, entry)].
         
-        for path in paths:
-            if "*" in path:
-                # Handle wildcard paths
-                import glob
-                for match in glob.glob(path):
-                    if os.path.exists(match):
-                        return match
-            elif os.path.exists(path):
-                return path
-        
-        # Try using 'which' command
-        try:
-            result = subprocess.run(["which", "code"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
+        Extension IDs are case-insensitive, so they are compared lowercased.
+        """
+        index = {}
+        for env_name, categories in extensions.items():
+            if env_name == "cli_tools":
+                continue
+            index[env_name] = [
+                (ext["id"].lower(), category, ext)
+                for category, exts in categories.items()
+                for ext in exts if "id" in ext
+            ]
+        return index
+    
+    def _plan_extensions(self, env_name, installed):
+        """Compare recommended extensions with an installed index in one pass.
         
-        return None
+        An entry's "version" pins it to exactly that version; otherwise its
+        "min_version", if any, is the oldest acceptable version.
+        
+        Returns:
+            {"install": ..., "upgrade": ..., "downgrade": ...}, each as
+            {category: [entry]}; upgraded and downgraded entries carry
+            "installed_version" and "target_version" (None for the latest)
+        """
+        plan = {"install": {}, "upgrade": {}, "downgrade": {}}
+        for key, category, ext in self.recommended_index.get(env_name, []):
+            if key not in installed:
+                plan["install"].setdefault(category, []).append(ext)
+                continue
+            installed_version = installed[key][1]
+            if not is_numeric_version(installed_version):
+                # An unknown installed version cannot be compared with a pin
+                continue
+            pinned = ext.get("version")
+            minimum = ext.get("min_version")
+            if pinned and version_key(installed_version) != version_key(pinned):
+                action = "upgrade" if version_key(installed_version) < version_key(pinned) else "downgrade"
+            elif not pinned and minimum and version_key(installed_version) < version_key(minimum):
+                action = "upgrade"
+            else:
+                continue
+            plan[action].setdefault(category, []).append(
+                dict(ext, installed_version=installed_version, target_version=pinned)
+            )
+        return plan
+    
+    @staticmethod
+    def _install_target(ext):
+        """Get what to pass to --install-extension for an entry: its ID, with @version when pinned."""
+        return f"{ext['id']}@{ext['version']}" if ext.get("version") else ext["id"]
+    
+    def detect_vscode(self):
+        """Detect if VSCode is installed and return the path."""
+        return self._discover("vscode", lambda: self.engine.find_cli("vscode"))
     
     def detect_vscode_insiders(self):
         """Detect if VSCode Insiders is installed and return the path."""
-        # Similar to detect_vscode but for Insiders
-        paths = [
-            # Linux
-            "/usr/bin/code-insiders",
-            "/usr/local/bin/code-insiders",
-            # macOS
-            "/Applications/Visual Studio Code - Insiders.app/Contents/Resources/app/bin/code",
-            # Windows (via WSL)
-            "/mnt/c/Program Files/Microsoft VS Code Insiders/bin/code-insiders",
-            "/mnt/c/Users/*/AppData/Local/Programs/Microsoft VS Code Insiders/bin/code-insiders"
-        ]
-        
-        for path in paths:
-            if "*" in path:
-                # Handle wildcard paths
-                import glob
-                for match in glob.glob(path):
-                    if os.path.exists(match):
-                        return match
-            elif os.path.exists(path):
-                return path
-        
-        # Try using 'which' command
-        try:
-            result = subprocess.run(["which", "code-insiders"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
-        
-        return None
+        return self._discover("vscode_insiders", lambda: self.engine.find_cli("vscode_insiders"))
     
     def detect_trae_ide(self):
         """Detect if Trae IDE is installed and return the path."""
-        # Paths for Trae IDE
-        paths = [
-            # Common installation paths
-            "/usr/bin/trae",
-            "/usr/local/bin/trae",
-            "/Applications/Trae.app/Contents/Resources/app/bin/trae",
-            "/mnt/c/Program Files/Trae/bin/trae",
-            "/mnt/c/Users/*/AppData/Local/Programs/Trae/bin/trae"
-        ]
-        
-        for path in paths:
-            if "*" in path:
-                import glob
-                for match in glob.glob(path):
-                    if os.path.exists(match):
-                        return match
-            elif os.path.exists(path):
-                return path
-        
-        # Try using 'which' command
-        try:
-            result = subprocess.run(["which", "trae"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
-        
-        return None
+        return self._discover("trae_ide", lambda: self.engine.find_cli("trae"))
     
     def detect_void_ide(self):
         """Detect if VOID IDE is installed and return the path."""
-        # Paths for VOID IDE
-        paths = [
-            # Common installation paths
-            "/usr/bin/void",
-            "/usr/local/bin/void",
-            "/Applications/VOID.app/Contents/Resources/app/bin/void",
-            "/mnt/c/Program Files/VOID/bin/void",
-            "/mnt/c/Users/*/AppData/Local/Programs/VOID/bin/void"
-        ]
-        
-        for path in paths:
-            if "*" in path:
-                import glob
-                for match in glob.glob(path):
-                    if os.path.exists(match):
-                        return match
-            elif os.path.exists(path):
-                return path
-        
-        # Try using 'which' command
-        try:
-            result = subprocess.run(["which", "void"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
-        
-        return None
+        return self._discover("void_ide", lambda: self.engine.find_cli("void"))
     
     def detect_aider(self):
         """Detect if Aider is installed and return the path."""
-        # Try using 'which' command
-        try:
-            result = subprocess.run(["which", "aider"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
+        return self._discover("aider", self._find_aider)
+    
+    def _find_aider(self):
+        """Look up Aider as an executable or a pip package."""
+        path = self.engine.find_executable("aider")
+        if path:
+            return path
         
         # Check if it's installed via pip
-        try:
-            result = subprocess.run(["pip", "show", "aider-chat"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return "aider-chat (pip package)"
-        except:
-            pass
+        if self.engine.installed_package("aider"):
+            return "aider-chat (pip package)"
         
         return None
     
     def detect_cline(self):
         """Detect if Cline is installed and return the path."""
         # Check for Cline extension in VSCode
-        vscode_path = self.detect_vscode()
-        if vscode_path:
-            try:
-                result = subprocess.run([vscode_path, "--list-extensions"], capture_output=True, text=True)
-                if "Cline.cline" in result.stdout:
-                    return "Cline (VSCode extension)"
-            except:
-                pass
+        if self._discover("cline", lambda: self.engine.has_extension("cline")):
+            return "Cline (VSCode extension)"
         
         return None
     
     def detect_roo_code(self):
         """Detect if Roo Code is installed and return the path."""
         # Check for Roo Code extension in VSCode
-        vscode_path = self.detect_vscode()
-        if vscode_path:
-            try:
-                result = subprocess.run([vscode_path, "--list-extensions"], capture_output=True, text=True)
-                if "RooCode.roocode" in result.stdout:
-                    return "Roo Code (VSCode extension)"
-            except:
-                pass
+        if self._discover("roo_code", lambda: self.engine.has_extension("roo")):
+            return "Roo Code (VSCode extension)"
         
         return None
     
     def get_installed_vscode_extensions(self, vscode_path):
         """Get a list of installed VSCode extensions."""
+        return [ext_id for ext_id, _ in self.get_installed_vscode_extension_index(vscode_path).values()]
+    
+    def get_installed_vscode_extension_index(self, vscode_path):
+        """Get installed VSCode extensions as {lowercased id: (id, version)}."""
         if not vscode_path:
-            return []
+            return {}
         
-        try:
-            result = subprocess.run([vscode_path, "--list-extensions"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip().split('\n')
-            return []
-        except:
-            return []
+        # Read the profile's extensions folder; the CLI is only a fallback
+        profile = vscode_extensions.profile_for_cli(vscode_path)
+        return self._discover(
+            ("extensions", vscode_path),
+            lambda: {
+                ext["id"].lower(): (ext["id"], ext["version"])
+                for ext in vscode_extensions.list_extensions(profile, vscode_path)
+            }
+        )
     
     def detect_all_environments(self):
         """Detect all supported development environments."""
-        environments = {
-            "vscode": self.detect_vscode(),
-            "vscode_insiders": self.detect_vscode_insiders(),
-            "trae_ide": self.detect_trae_ide(),
-            "void_ide": self.detect_void_ide(),
-            "aider": self.detect_aider(),
-            "cline": self.detect_cline(),
-            "roo_code": self.detect_roo_code()
+        detectors = {
+            "vscode": self.detect_vscode,
+            "vscode_insiders": self.detect_vscode_insiders,
+            "trae_ide": self.detect_trae_ide,
+            "void_ide": self.detect_void_ide,
+            "aider": self.detect_aider,
+            "cline": self.detect_cline,
+            "roo_code": self.detect_roo_code
         }
         
+        environments = {}
+        for name, detect in detectors.items():
+            with measure(self.profiler, name, "extension_manager"):
+                environments[name] = detect()
+        
         # Filter out uninstalled environments
         return {k: v for k, v in environments.items() if v}
     
-    def detect_missing_extensions(self):
-        """Detect which recommended extensions are missing from each environment."""
+    def detect_missing_extensions(self, previous=None, changed=None):
+        """Detect which recommended extensions are missing from each environment.
+        
+        When the missing extensions from an earlier run (previous) and the
+        environments that changed since then (changed) are given, only changed
+        environments are re-checked and the others reuse their earlier result.
+        Extensions installed below their recommended "min_version", or at
+        another version than their pinned "version", are recorded in
+        outdated_extensions.
+        """
         environments = self.detect_all_environments()
         
         for env_name, env_path in environments.items():
-            if env_name == "vscode":
-                installed = self.get_installed_vscode_extensions(env_path)
-                self.installed_extensions[env_name] = installed
-                
-                # Check which recommended extensions are missing
-                if env_name in self.extensions:
-                    missing = {}
-                    for category, exts in self.extensions[env_name].items():
-                        missing_in_category = []
-                        for ext in exts:
-                            if "id" in ext and ext["id"] not in installed:
-                                missing_in_category.append(ext)
-                        if missing_in_category:
-                            missing[category] = missing_in_category
-                    
-                    if missing:
-                        self.missing_extensions[env_name] = missing
+            if previous is not None and changed is not None and env_name not in changed:
+                if env_name in previous:
+                    self.missing_extensions[env_name] = previous[env_name]
+                continue
             
-            elif env_name == "vscode_insiders":
-                installed = self.get_installed_vscode_extensions(env_path)
-                self.installed_extensions[env_name] = installed
+            if env_name in ("vscode", "vscode_insiders"):
+                with measure(self.profiler, f"{env_name}_extensions", "extension_manager"):
+                    installed = self.get_installed_vscode_extension_index(env_path)
+                self.installed_extensions[env_name] = [ext_id for ext_id, _ in installed.values()]
                 
-                # Check which recommended extensions are missing
-                if env_name in self.extensions:
-                    missing = {}
-                    for category, exts in self.extensions[env_name].items():
-                        missing_in_category = []
-                        for ext in exts:
-                            if "id" in ext and ext["id"] not in installed:
-                                missing_in_category.append(ext)
-                        if missing_in_category:
-                            missing[category] = missing_in_category
-                    
-                    if missing:
-                        self.missing_extensions[env_name] = missing
+                # Check which recommended extensions are missing or older than recommended
+                plan = self._plan_extensions(env_name, installed)
+                if plan["install"]:
+                    self.missing_extensions[env_name] = plan["install"]
+                outdated = {}
+                for action in ("upgrade", "downgrade"):
+                    for category, exts in plan[action].items():
+                        outdated.setdefault(category, []).extend(exts)
+                if outdated:
+                    self.outdated_extensions[env_name] = outdated
             
             # For CLI tools like Aider, we'd need a different approach
             elif env_name == "aider" and "cli_tools" in self.extensions and "aider" in self.extensions["cli_tools"]:
@@ -289,18 +277,102 @@ class ExtensionManager:
     
     def install_vscode_extension(self, vscode_path, extension_id):
         """Install a VSCode extension."""
-        try:
-            print(f"Installing extension: {extension_id}")
-            result = subprocess.run([vscode_path, "--install-extension", extension_id], capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"Successfully installed {extension_id}")
-                return True
+        return self.install_vscode_extensions(vscode_path, [extension_id])[extension_id]
+    
+    def _install_batch(self, vscode_path, extension_ids, force=False, on_result=None):
+        """Install VSCode extensions with a single CLI call, returning {extension_id: success}.
+        
+        Extensions in the local VSIX store are installed from their package.
+        on_result(extension_id, success) is called as the CLI reports each one.
+        """
+        sources = {}
+        for ext_id in extension_ids:
+            name, _, version = ext_id.partition("@")
+            package = self.vsix_cache.lookup(name, version or None)
+            if package:
+                sources[ext_id] = package
+            elif self.offline:
+                print(f"{ext_id} is not in the local VSIX cache, skipping (offline)")
             else:
-                print(f"Failed to install {extension_id}: {result.stderr}")
-                return False
-        except Exception as e:
-            print(f"Error installing {extension_id}: {e}")
-            return False
+                sources[ext_id] = ext_id
+        
+        by_source = {source: ext_id for ext_id, source in sources.items()}
+        report = (lambda source, installed: on_result(by_source[source], installed)) if on_result else None
+        installed = vscode_extensions.install_extensions(
+            vscode_path, list(sources.values()), force=force, on_result=report
+        ) if sources else {}
+        return {ext_id: ext_id in sources and installed.get(sources[ext_id], False) for ext_id in extension_ids}
+    
+    def _resolve_roots(self, vscode_path, extension_ids):
+        """Split extensions into those to install and those another one installs as a pack member or dependency.
+        
+        Packs and dependencies are read from installed extensions' manifests
+        and from packages in the VSIX store. Only extensions that are not
+        installed at all are left out; pinned versions (id@version) are
+        always installed.
+        
+        Returns:
+            (roots, covered): extensions to install, and {left-out extension: root that installs it}
+        """
+        installed = vscode_extensions.list_extensions(vscode_extensions.profile_for_cli(vscode_path), vscode_path)
+        installed_ids = {ext["id"].lower() for ext in installed}
+        names = {ext_id: ext_id.partition("@")[0] for ext_id in extension_ids}
+        graph = extension_graph.build_graph(
+            {ext["id"]: ext.get("bundled", []) for ext in installed},
+            {name: self.vsix_cache.bundled(name) for name in names.values()}
+        )
+        candidates = [name for ext_id, name in names.items() if "@" not in ext_id and name.lower() not in installed_ids]
+        root_names, covered_names = extension_graph.minimal_roots(list(names.values()), graph, candidates)
+        
+        by_name = {name: ext_id for ext_id, name in names.items()}
+        roots = [by_name[name] for name in root_names]
+        covered = {by_name[name]: by_name[root] for name, root in covered_names.items()}
+        return roots, covered
+    
+    def install_vscode_extensions(self, vscode_path, extension_ids, force=False, on_result=None):
+        """Install VSCode extensions with a single CLI call, returning {extension_id: success}.
+        
+        IDs may carry a version (publisher.name@1.2.3). Extensions that a
+        pack or dependency among the others installs are not passed to the
+        CLI; if they are still missing afterwards they are installed on their
+        own. Extensions in the local VSIX store are installed from their
+        package. With force, installed extensions are replaced by the
+        requested version. on_result(extension_id, success) is called once
+        per extension, as soon as its outcome is known.
+        """
+        reported = set()
+        
+        def report(ext_id, installed):
+            if on_result is not None and ext_id not in reported:
+                reported.add(ext_id)
+                on_result(ext_id, installed)
+        
+        roots, covered = self._resolve_roots(vscode_path, extension_ids)
+        for ext_id, root in covered.items():
+            print(f"{ext_id} is installed with {root}")
+        print(f"Installing extensions: {', '.join(roots)}")
+        results = self._install_batch(vscode_path, roots, force, report)
+        
+        if covered:
+            # Check the packs and dependencies brought them in
+            profile = vscode_extensions.profile_for_cli(vscode_path)
+            now_installed = {ext["id"].lower() for ext in vscode_extensions.list_extensions(profile, vscode_path)}
+            retry = [ext_id for ext_id in covered if ext_id.lower() not in now_installed]
+            for ext_id in covered:
+                if ext_id not in retry:
+                    results[ext_id] = True
+                    report(ext_id, True)
+            if retry:
+                results.update(self._install_batch(vscode_path, retry, force, report))
+        
+        results = {ext_id: results[ext_id] for ext_id in extension_ids}
+        for ext_id, installed in results.items():
+            report(ext_id, installed)
+            if installed:
+                print(f"Successfully installed {ext_id}")
+            else:
+                print(f"Failed to install {ext_id}")
+        return results
     
     def install_cli_tool(self, tool_name, install_command):
         """Install a CLI tool."""
@@ -317,46 +389,180 @@ class ExtensionManager:
             print(f"Error installing {tool_name}: {e}")
             return False
     
-    def install_selected_extensions(self, selections):
-        """Install the selected extensions."""
+    def _run_in_target(self, target, install):
+        """Run an install while holding its target's lock."""
+        with self._target_locks_lock:
+            lock = self._target_locks.setdefault(target, threading.Lock())
+        with lock:
+            return install()
+    
+    def _install_profile_extensions(self, label, env_name, vscode_path, ext_ids, reporter, journal, force=False):
+        """Install extensions into one VSCode profile, returning [(result label, success)]."""
+        for ext_id in ext_ids:
+            reporter.started(f"{label}: {ext_id}", env_name)
+        
+        def on_result(ext_id, installed):
+            # Recorded as soon as the CLI reports it, not when the whole batch ends
+            journal.record(f"{env_name}:{ext_id.lower()}", installed)
+            reporter.finished(f"{label}: {ext_id}", installed, env_name)
+        
+        # Every selected extension goes to one CLI call
+        return [
+            (f"{label}: {ext_id}", installed)
+            for ext_id, installed in self.install_vscode_extensions(vscode_path, ext_ids, force, on_result).items()
+        ]
+    
+    def _install_cli_tools(self, label, target, tools, reporter, journal):
+        """Install CLI tools one after another, returning [(result label, success)]."""
+        results = []
+        for tool in tools:
+            reporter.started(f"{label}: {tool['name']}", target)
+            installed = self.install_cli_tool(tool["name"], tool["install_command"])
+            journal.record(f"cli:{tool['name']}", installed)
+            reporter.finished(f"{label}: {tool['name']}", installed, target)
+            results.append((f"{label}: {tool['name']}", installed))
+        return results
+    
+    def install_selected_extensions(self, selections, max_workers=None, resume=False, force=False, progress=None,
+                                    journal=None):
+        """Install the selected extensions.
+        
+        Different targets (each VSCode profile, each pip installer) are installed
+        into concurrently, up to max_workers (defaults to the instance's limit);
+        installs into the same target run one after another.
+        
+        Planned and finished steps are written to journal (defaults to the
+        install journal). With resume, steps the interrupted run's journal
+        confirms as completed are counted as installed without installing or
+        checking them again. With force, installed extensions are replaced by
+        the selected version.
+        
+        progress, if given, is called with an InstallEvent as each item is
+        queued, started, finished or failed (see install_progress).
+        """
         results = {"success": [], "failed": []}
+        reporter = ProgressReporter(progress)
+        journal = journal or self.journal
+        journal.begin(resume)
+        completed = journal.completed_steps() if resume else set()
+        planned = []
         
+        # (target, install returning [(result label, success)])
+        jobs = []
         for env_name, categories in selections.items():
-            if env_name == "vscode":
-                vscode_path = self.detect_vscode()
+            if env_name in ("vscode", "vscode_insiders"):
+                label = "VSCode" if env_name == "vscode" else "VSCode Insiders"
+                vscode_path = self.detect_vscode() if env_name == "vscode" else self.detect_vscode_insiders()
                 if not vscode_path:
-                    print("VSCode not found, skipping extension installation")
+                    print(f"{label} not found, skipping extension installation")
                     continue
                 
-                for category, extensions in categories.items():
-                    for ext_id in extensions:
-                        if self.install_vscode_extension(vscode_path, ext_id):
-                            results["success"].append(f"VSCode: {ext_id}")
-                        else:
-                            results["failed"].append(f"VSCode: {ext_id}")
-            
-            elif env_name == "vscode_insiders":
-                vscode_path = self.detect_vscode_insiders()
-                if not vscode_path:
-                    print("VSCode Insiders not found, skipping extension installation")
-                    continue
-                
-                for category, extensions in categories.items():
-                    for ext_id in extensions:
-                        if self.install_vscode_extension(vscode_path, ext_id):
-                            results["success"].append(f"VSCode Insiders: {ext_id}")
-                        else:
-                            results["failed"].append(f"VSCode Insiders: {ext_id}")
+                ext_ids = []
+                for ext_id in (ext_id for extensions in categories.values() for ext_id in extensions):
+                    step = f"{env_name}:{ext_id.lower()}"
+                    if step in completed:
+                        print(f"Skipping {ext_id} (completed in the interrupted run)")
+                        results["success"].append(f"{label}: {ext_id}")
+                        reporter.skipped(f"{label}: {ext_id}", env_name)
+                    else:
+                        planned.append(step)
+                        ext_ids.append(ext_id)
+                        reporter.queued(f"{label}: {ext_id}", env_name)
+                if ext_ids:
+                    jobs.append((env_name, lambda label=label, env_name=env_name, path=vscode_path, ids=ext_ids:
+                                 self._install_profile_extensions(label, env_name, path, ids, reporter, journal, force)))
             
             elif env_name == "aider":
-                for category, tools in categories.items():
+                # Tools installed by the same installer (e.g. pip) share its target
+                by_installer = {}
+                for tools in categories.values():
                     for tool in tools:
-                        if self.install_cli_tool(tool["name"], tool["install_command"]):
+                        step = f"cli:{tool['name']}"
+                        installer = tool["install_command"].split()[0]
+                        if step in completed:
+                            print(f"Skipping {tool['name']} (completed in the interrupted run)")
                             results["success"].append(f"Aider: {tool['name']}")
-                        else:
-                            results["failed"].append(f"Aider: {tool['name']}")
+                            reporter.skipped(f"Aider: {tool['name']}", f"cli:{installer}")
+                            continue
+                        planned.append(step)
+                        reporter.queued(f"Aider: {tool['name']}", f"cli:{installer}")
+                        by_installer.setdefault(installer, []).append(tool)
+                for installer, tools in by_installer.items():
+                    target = f"cli:{installer}"
+                    jobs.append((target, lambda target=target, tools=tools:
+                                 self._install_cli_tools("Aider", target, tools, reporter, journal)))
+        
+        journal.plan(planned)
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                futures = [executor.submit(self._run_in_target, target, install) for target, install in jobs]
+                # Results are collected in selection order, whatever order installs finish in
+                for future in futures:
+                    for result_label, installed in future.result():
+                        results["success" if installed else "failed"].append(result_label)
+        journal.finish()
+        
+        # Installed tools and extensions change what discovery finds
+        if results["success"]:
+            self.invalidate()
         
         return results
+    
+    def iter_install_events(self, selections, **kwargs):
+        """Install the selected extensions in the background, yielding progress events as they happen.
+        
+        Takes install_selected_extensions' arguments. The last event is a
+        "done" event whose results are install_selected_extensions' results.
+        """
+        return stream_events(self.install_selected_extensions, selections, **kwargs)
+    
+    @staticmethod
+    def format_plan(plan):
+        """Render a reconciliation plan as readable lines."""
+        lines = []
+        for action, categories in plan.items():
+            for exts in categories.values():
+                for ext in exts:
+                    if action == "install":
+                        lines.append(f"+ {ext['id']}" + (f" {ext['version']}" if ext.get("version") else ""))
+                    else:
+                        target = ext["target_version"] or "latest"
+                        lines.append(f"{'^' if action == 'upgrade' else 'v'} {ext['id']}: {ext['installed_version']} -> {target}")
+        return lines
+    
+    def reconcile_extensions(self, max_workers=None, resume=False, progress=None):
+        """Bring each VSCode profile to the recommended extensions and versions.
+        
+        Missing extensions are installed, and installed ones below their
+        "min_version" or off their pinned "version" are upgraded or
+        downgraded, in one batched CLI call per profile. Extensions already
+        at an acceptable version are left alone. progress receives install
+        events as in install_selected_extensions.
+        
+        Returns:
+            (plans, results): each profile's plan as returned by
+            _plan_extensions, and the install results
+        """
+        plans = {}
+        selections = {}
+        for env_name, detect in (("vscode", self.detect_vscode), ("vscode_insiders", self.detect_vscode_insiders)):
+            vscode_path = detect()
+            if not vscode_path:
+                continue
+            plan = self._plan_extensions(env_name, self.get_installed_vscode_extension_index(vscode_path))
+            plans[env_name] = plan
+            targets = {}
+            for categories in plan.values():
+                for category, exts in categories.items():
+                    targets.setdefault(category, []).extend(self._install_target(ext) for ext in exts)
+            if targets:
+                selections[env_name] = targets
+        
+        if not selections:
+            return plans, {"success": [], "failed": []}
+        # Upgrades and downgrades replace installed versions
+        return plans, self.install_selected_extensions(selections, max_workers, resume, force=True, progress=progress,
+                                                       journal=self.reconcile_journal)
 
 # Example usage
 if __name__ == "__main__":
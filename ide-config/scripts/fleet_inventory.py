@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+fleet_inventory.py - Fleet inventory for Dev Environment Readyifier
+
+This script aggregates detection reports (the JSON printed by detector.py)
+collected from many machines into one SQLite database, indexed by tool,
+version and extension, and answers fleet-wide questions such as which
+machines lack an extension or which versions of a tool are deployed.
+
+Reports are read one at a time, so memory use does not grow with the number
+of reports. A file may hold a single report, a JSON array of reports or one
+report per line (JSON Lines), and is decoded incrementally rather than read
+whole. Each machine is identified by the report's hostname, falling back to
+the file name; importing a machine again replaces its previous report.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (
+    machine_id TEXT PRIMARY KEY,
+    source TEXT,
+    system TEXT,
+    release TEXT,
+    python_version TEXT,
+    imported_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tools (
+    machine_id TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    version TEXT,
+    path TEXT,
+    PRIMARY KEY (machine_id, tool)
+);
+CREATE INDEX IF NOT EXISTS idx_tools_tool_version ON tools (tool, version);
+CREATE TABLE IF NOT EXISTS extensions (
+    machine_id TEXT NOT NULL,
+    extension_id TEXT NOT NULL,
+    version TEXT,
+    PRIMARY KEY (machine_id, extension_id)
+);
+CREATE INDEX IF NOT EXISTS idx_extensions_id_version ON extensions (extension_id, version);
+CREATE TABLE IF NOT EXISTS conda_environments (
+    machine_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (machine_id, path)
+);
+"""
+
+# Report sections holding tools, and the kind stored for each
+TOOL_SECTIONS = {"ides": "ide", "ai_tools": "ai_tool"}
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open the inventory database, creating the schema if needed."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# Characters read at a time from files that are not JSON Lines
+READ_CHUNK_SIZE = 1 << 16
+
+
+def _iter_documents(f) -> Iterator[Any]:
+    """Yield the JSON documents in a file without reading it whole.
+
+    Documents are decoded with raw_decode as chunks arrive, so a file may hold
+    one document or several in a row. A top-level array is not decoded whole:
+    its elements are yielded one at a time. Text that cannot be decoded is
+    skipped up to the next line.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = False
+    while True:
+        while pos < len(buffer) and (buffer[pos].isspace() or (in_array and buffer[pos] == ",")):
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = f.read(READ_CHUNK_SIZE), 0
+            eof = not buffer
+            continue
+
+        if not in_array and buffer[pos] == "[":
+            in_array = True
+            pos += 1
+            continue
+        if in_array and buffer[pos] == "]":
+            in_array = False
+            pos += 1
+            continue
+
+        try:
+            document, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            if not eof:
+                # The document may continue in the next chunk; read at least as much as is
+                # buffered so a large document is not decoded again for every chunk
+                chunk = f.read(max(READ_CHUNK_SIZE, len(buffer) - pos))
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                eof = not chunk
+                continue
+            newline = buffer.find("\n", pos)
+            if newline == -1:
+                return
+            pos = newline + 1
+            in_array = False
+            continue
+        pos = end
+        yield document
+
+
+def _iter_lines(f) -> Iterator[Any]:
+    """Yield the JSON document on each line of a JSON Lines file, skipping invalid lines."""
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def read_reports(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the detection reports in a file, one at a time.
+
+    The file may hold one JSON report, a JSON array of reports, or one report
+    per line. Lines of a .jsonl file that are not valid JSON are skipped;
+    documents that are not JSON objects are skipped with a warning.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            documents = _iter_lines(f)
+        else:
+            documents = _iter_documents(f)
+
+        skipped = 0
+        for document in documents:
+            if isinstance(document, dict):
+                yield document
+            else:
+                skipped += 1
+        if skipped:
+            print(f"Warning: skipped {skipped} documents in {path} that are not reports")
+
+
+class FleetInventory:
+    """SQLite store of detection reports from many machines."""
+
+    def __init__(self, db_path: str):
+        """Initialize the inventory.
+
+        Args:
+            db_path: Path of the SQLite database (created if missing)
+        """
+        self.db_path = db_path
+        self.conn = connect(db_path)
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
+
+    def add_report(self, report: Dict[str, Any], machine_id: Optional[str] = None, source: Optional[str] = None) -> str:
+        """Store one machine's report, replacing any earlier report for it.
+
+        Args:
+            report: Detection results as returned by EnvironmentDetector.detect_environments
+            machine_id: Machine name (defaults to the report's hostname, then the source)
+            source: Where the report came from, e.g. its file name
+
+        Returns:
+            The machine ID the report was stored under
+        """
+        os_info = report.get("os_info", {})
+        machine_id = machine_id or os_info.get("hostname") or source or f"machine-{time.time_ns()}"
+
+        tools = [
+            (machine_id, tool, kind, info.get("version"), info.get("path"))
+            for section, kind in TOOL_SECTIONS.items()
+            for tool, info in (report.get(section) or {}).items()
+            if isinstance(info, dict)
+        ]
+        extensions = {}
+        for ext in report.get("vscode_extensions") or []:
+            if ext.get("id"):
+                # Marketplace IDs are case-insensitive
+                extensions[ext["id"].lower()] = ext.get("version")
+        environments = [
+            (machine_id, env.get("name", ""), env["path"])
+            for env in report.get("conda_environments") or [] if env.get("path")
+        ]
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO machines VALUES (?, ?, ?, ?, ?, ?)",
+            (machine_id, source, os_info.get("system"), os_info.get("release"),
+             os_info.get("python_version"), time.time())
+        )
+        for table in ("tools", "extensions", "conda_environments"):
+            self.conn.execute(f"DELETE FROM {table} WHERE machine_id = ?", (machine_id,))
+        self.conn.executemany("INSERT INTO tools VALUES (?, ?, ?, ?, ?)", tools)
+        self.conn.executemany(
+            "INSERT INTO extensions VALUES (?, ?, ?)",
+            [(machine_id, ext_id, version) for ext_id, version in extensions.items()]
+        )
+        self.conn.executemany("INSERT OR IGNORE INTO conda_environments VALUES (?, ?, ?)", environments)
+        return machine_id
+
+    def import_files(self, paths: List[str], batch_size: int = 200) -> int:
+        """Import every report in the given files, committing every batch_size reports.
+
+        Returns:
+            Number of reports imported
+        """
+        count = 0
+        for path in paths:
+            # Reports without a hostname are named after their file (and line)
+            name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                for index, report in enumerate(read_reports(path)):
+                    self.add_report(report, source=name if index == 0 else f"{name}:{index + 1}")
+                    count += 1
+                    if count % batch_size == 0:
+                        self.conn.commit()
+            except OSError as e:
+                print(f"Error reading {path}: {e}")
+        self.conn.commit()
+        return count
+
+    def machines(self) -> List[str]:
+        """Get every machine in the inventory."""
+        return [row[0] for row in self.conn.execute("SELECT machine_id FROM machines ORDER BY machine_id")]
+
+    def machines_lacking_extension(self, extension_id: str) -> List[str]:
+        """Get machines with VS Code that do not have an extension installed."""
+        rows = self.conn.execute(
+            """
+            SELECT t.machine_id FROM tools t
+            WHERE t.tool = 'vscode' AND NOT EXISTS (
+                SELECT 1 FROM extensions e
+                WHERE e.machine_id = t.machine_id AND e.extension_id = ?
+            )
+            ORDER BY t.machine_id
+            """,
+            (extension_id.lower(),)
+        )
+        return [row[0] for row in rows]
+
+    def machines_with_tool(self, tool: str, version: Optional[str] = None) -> List[str]:
+        """Get machines that have a tool, optionally at one version."""
+        if version is None:
+            rows = self.conn.execute(
+                "SELECT machine_id FROM tools WHERE tool = ? ORDER BY machine_id", (tool,)
+            )
+        else:
+            rows = self.conn.execute(
+                "SELECT machine_id FROM tools WHERE tool = ? AND version = ? ORDER BY machine_id",
+                (tool, version)
+            )
+        return [row[0] for row in rows]
+
+    def tool_versions(self, tool: str) -> List[Tuple[str, int]]:
+        """Get the deployed versions of a tool and how many machines run each, most common first."""
+        rows = self.conn.execute(
+            """
+            SELECT COALESCE(version, 'Unknown'), COUNT(*) FROM tools
+            WHERE tool = ? GROUP BY version ORDER BY COUNT(*) DESC, version
+            """,
+            (tool,)
+        )
+        return [(version, count) for version, count in rows]
+
+    def extension_versions(self, extension_id: str) -> List[Tuple[str, int]]:
+        """Get the installed versions of an extension and how many machines have each."""
+        rows = self.conn.execute(
+            """
+            SELECT COALESCE(version, 'Unknown'), COUNT(*) FROM extensions
+            WHERE extension_id = ? GROUP BY version ORDER BY COUNT(*) DESC, version
+            """,
+            (extension_id.lower(),)
+        )
+        return [(version, count) for version, count in rows]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get machine counts per tool and the number of machines in the inventory."""
+        tools = dict(self.conn.execute("SELECT tool, COUNT(*) FROM tools GROUP BY tool ORDER BY tool"))
+        machine_count = self.conn.execute("SELECT COUNT(*) FROM machines").fetchone()[0]
+        return {"machines": machine_count, "tools": tools}
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Aggregate detection reports from many machines")
+    parser.add_argument("--db", default="fleet_inventory.db", help="Inventory database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import detection report files")
+    import_parser.add_argument("files", nargs="+", help="Report files (.json, or .jsonl with one report per line)")
+
+    lacking_parser = commands.add_parser("lacking-extension", help="List machines with VS Code that lack an extension")
+    lacking_parser.add_argument("extension_id")
+
+    versions_parser = commands.add_parser("versions", help="Show deployed versions of a tool")
+    versions_parser.add_argument("tool")
+
+    ext_versions_parser = commands.add_parser("extension-versions", help="Show installed versions of an extension")
+    ext_versions_parser.add_argument("extension_id")
+
+    machines_parser = commands.add_parser("machines-with", help="List machines that have a tool")
+    machines_parser.add_argument("tool")
+    machines_parser.add_argument("--version", help="Only machines at this version")
+
+    commands.add_parser("summary", help="Show machine counts per tool")
+
+    args = parser.parse_args(argv)
+    inventory = FleetInventory(args.db)
+    try:
+        if args.command == "import":
+            count = inventory.import_files(args.files)
+            print(f"Imported {count} reports into {args.db}")
+        elif args.command == "lacking-extension":
+            for machine in inventory.machines_lacking_extension(args.extension_id):
+                print(machine)
+        elif args.command == "versions":
+            for version, count in inventory.tool_versions(args.tool):
+                print(f"{version}\t{count}")
+        elif args.command == "extension-versions":
+            for version, count in inventory.extension_versions(args.extension_id):
+                print(f"{version}\t{count}")
+        elif args.command == "machines-with":
+            for machine in inventory.machines_with_tool(args.tool, args.version):
+                print(machine)
+        elif args.command == "summary":
+            print(json.dumps(inventory.summary(), indent=2))
+    finally:
+        inventory.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -16,6 +16,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox, font
 from typing import Dict, List, Any, Optional
 
+try:
+    from scripts.install_progress import format_event, FINISHED, FAILED, SKIPPED
+except ImportError:
+    from install_progress import format_event, FINISHED, FAILED, SKIPPED
+
 class GUIManager:
     """Manages the GUI interface for the Dev Environment Readyifier."""
     
@@ -1016,6 +1021,14 @@ class GUIManager:
                 if var.get():
                     self.selected_md_files.append(template_name)
     
+    def _on_install_event(self, event):
+        """Log an install progress event and advance the progress bar (called from install threads)."""
+        line = format_event(event)
+        if line:
+            self._update_config_log(f"  {line}")
+        if event.kind in (FINISHED, FAILED, SKIPPED):
+            self.root.after(0, lambda: self.config_progress.step(1))
+    
     def _configuration_thread(self):
         """Configuration thread to avoid blocking the UI."""
         try:
@@ -1046,15 +1059,23 @@ class GUIManager:
             # Install extensions
             if self.selected_extensions:
                 self._update_config_log("Installing extensions...")
-                for env_name, categories in self.selected_extensions.items():
-                    for category, ext_ids in categories.items():
-                        if ext_ids:
-                            self._update_config_log(f"  Installing {len(ext_ids)} extensions for {env_name} ({category})...")
-                            # Convert extension IDs to proper format for installer
-                            selections = {env_name: {category: ext_ids}}
-                            results = self.extension_manager.install_selected_extensions(selections)
-                            self._update_config_log(f"    Successfully installed: {len(results['success'])}")
-                            self._update_config_log(f"    Failed installations: {len(results['failed'])}")
+                # The bar advances per extension while extensions install
+                self.root.after(0, self.config_progress.stop)
+                self.root.after(0, lambda: self.config_progress.config(
+                    mode="determinate", maximum=max(ext_count, 1), value=0))
+                if ext_count:
+                    # One call installs every environment, each target concurrently in one batch
+                    for env_name, categories in self.selected_extensions.items():
+                        env_count = sum(len(ext_ids) for ext_ids in categories.values())
+                        if env_count:
+                            self._update_config_log(f"  Installing {env_count} extensions for {env_name}...")
+                    results = self.extension_manager.install_selected_extensions(
+                        self.selected_extensions, progress=self._on_install_event
+                    )
+                    self._update_config_log(f"    Successfully installed: {len(results['success'])}")
+                    self._update_config_log(f"    Failed installations: {len(results['failed'])}")
+                self.root.after(0, lambda: self.config_progress.config(mode="indeterminate"))
+                self.root.after(0, self.config_progress.start)
             
             # Create specialized markdown files
             if self.selected_md_files:
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+install_journal.py - Resumable install journal for Dev Environment Readyifier
+
+This script records install runs as an append-only JSON Lines journal: the
+steps a run plans, then each step as it completes or fails. Every record is
+flushed to disk before the next step starts, so after a crash, Ctrl-C or
+network failure a resumed run can skip the steps the journal confirms as
+completed instead of installing or re-checking them again.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from typing import Dict, List, Any, Optional, Set
+
+try:
+    from scripts.detection_cache import default_cache_dir
+except ImportError:
+    from detection_cache import default_cache_dir
+
+
+def default_journal_path(name: str) -> str:
+    """Get the per-user journal file for an installer (e.g. "extensions" or "tools")."""
+    return os.path.join(default_cache_dir(), "journal", f"{name}.jsonl")
+
+
+class InstallJournal:
+    """Append-only record of planned, completed and failed install steps."""
+
+    def __init__(self, name: str, path: Optional[str] = None):
+        """Initialize the journal.
+
+        Args:
+            name: Installer the journal belongs to, used in the default file name
+            path: Journal file (defaults to the per-user journal directory)
+        """
+        self.name = name
+        self.path = path or default_journal_path(name)
+        self.run_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _append(self, event: str, **fields):
+        """Append one record and flush it to disk."""
+        record = {"ts": time.time(), "run": self.run_id, "event": event}
+        record.update(fields)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Read every record, skipping a torn last line left by a crash."""
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return records
+
+    def begin(self, resume: bool = False):
+        """Start a run, or with resume continue the last one if it never finished.
+
+        A new run is appended under a fresh run ID; records of earlier runs
+        are kept but no longer count as completed.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if resume:
+            last_run = None
+            finished = set()
+            for record in self.records():
+                if record.get("event") == "run_started":
+                    last_run = record["run"]
+                elif record.get("event") == "run_finished":
+                    finished.add(record["run"])
+            if last_run is not None and last_run not in finished:
+                self.run_id = last_run
+                self._append("run_resumed")
+                return
+
+        self.run_id = uuid.uuid4().hex
+        self._append("run_started")
+
+    def completed_steps(self) -> Set[str]:
+        """Get the steps of the current run confirmed as completed."""
+        return {
+            record["step"] for record in self.records()
+            if record.get("run") == self.run_id and record.get("event") == "completed"
+        }
+
+    def plan(self, steps: List[str]):
+        """Record the steps a run is about to perform."""
+        if steps:
+            self._append("planned", steps=steps)
+
+    def record(self, step: str, success: bool):
+        """Record the outcome of a step."""
+        self._append("completed" if success else "failed", step=step)
+
+    def finish(self):
+        """Record the end of the run."""
+        self._append("run_finished")
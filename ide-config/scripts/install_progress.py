@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+install_progress.py - Streaming install progress for Dev Environment Readyifier
+
+This script defines the structured events installs report while they run:
+every item is "queued" when its install is planned, "started" when its CLI
+call begins, and "finished" or "failed" (with its duration) as soon as the
+CLI reports it; items a resumed run already completed are "skipped". Events
+go to a callback, or can be consumed as an iterator with stream_events(), so
+the GUI and the CLI render per-item progress live instead of waiting for the
+final results.
+"""
+
+import time
+import queue
+import threading
+from typing import Dict, Any, Callable, Iterator, Optional
+
+QUEUED = "queued"
+STARTED = "started"
+FINISHED = "finished"
+FAILED = "failed"
+SKIPPED = "skipped"
+# Last event of stream_events(), carrying the install results
+DONE = "done"
+
+
+class InstallEvent:
+    """One progress event for an install item."""
+
+    def __init__(self, kind: str, label: Optional[str] = None, target: Optional[str] = None,
+                 duration: Optional[float] = None, results: Optional[Dict[str, Any]] = None):
+        """Initialize an event.
+
+        Args:
+            kind: QUEUED, STARTED, FINISHED, FAILED, SKIPPED or DONE
+            label: Item, as labelled in install results (e.g. "VSCode: ms-python.python")
+            target: Install target the item belongs to (e.g. "vscode" or "cli:pip")
+            duration: Seconds from started to finished or failed
+            results: Install results, on the DONE event
+        """
+        self.kind = kind
+        self.label = label
+        self.target = target
+        self.duration = duration
+        self.results = results
+        self.time = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the event to a JSON-serializable dict."""
+        event = {"kind": self.kind, "label": self.label, "target": self.target, "time": self.time}
+        if self.duration is not None:
+            event["duration_ms"] = round(self.duration * 1000, 2)
+        if self.results is not None:
+            event["results"] = self.results
+        return event
+
+
+def format_event(event: InstallEvent) -> Optional[str]:
+    """Render an event as a progress line, or None for events not worth a line."""
+    if event.kind == STARTED:
+        return f"  … {event.label}"
+    if event.kind == FINISHED:
+        return f"  ✓ {event.label} ({event.duration:.1f}s)"
+    if event.kind == FAILED:
+        return f"  ✗ {event.label} ({event.duration:.1f}s)"
+    if event.kind == SKIPPED:
+        return f"  ✓ {event.label} (completed earlier)"
+    return None
+
+
+class ProgressReporter:
+    """Sends install events to a callback, timing each item and reporting its outcome once."""
+
+    def __init__(self, callback: Optional[Callable[[InstallEvent], None]] = None):
+        """Initialize the reporter; without a callback, events are dropped."""
+        self.callback = callback
+        self._started: Dict[str, float] = {}
+        self._done = set()
+        self._lock = threading.Lock()
+
+    def _emit(self, event: InstallEvent):
+        """Send an event to the callback."""
+        if self.callback is not None:
+            self.callback(event)
+
+    def queued(self, label: str, target: Optional[str] = None):
+        """Report that an item is planned."""
+        self._emit(InstallEvent(QUEUED, label, target))
+
+    def skipped(self, label: str, target: Optional[str] = None):
+        """Report that an item is not installed because an earlier run completed it."""
+        self._emit(InstallEvent(SKIPPED, label, target))
+
+    def started(self, label: str, target: Optional[str] = None):
+        """Report that an item's install has begun."""
+        with self._lock:
+            self._started[label] = time.perf_counter()
+        self._emit(InstallEvent(STARTED, label, target))
+
+    def finished(self, label: str, success: bool, target: Optional[str] = None):
+        """Report an item's outcome; later reports for the same item are ignored."""
+        with self._lock:
+            if label in self._done:
+                return
+            self._done.add(label)
+            started = self._started.get(label)
+        duration = time.perf_counter() - started if started is not None else 0.0
+        self._emit(InstallEvent(FINISHED if success else FAILED, label, target, duration))
+
+
+def stream_events(install: Callable[..., Dict[str, Any]], *args, **kwargs) -> Iterator[InstallEvent]:
+    """Run an install that accepts a progress callback and yield its events as they happen.
+
+    install runs in a background thread with progress= set. The last event is
+    DONE, carrying the results install returned; an exception it raises is
+    raised again here.
+    """
+    events: queue.Queue = queue.Queue()
+    outcome: Dict[str, Any] = {}
+
+    def run():
+        try:
+            outcome["results"] = install(*args, progress=events.put, **kwargs)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        yield event
+
+    if "error" in outcome:
+        raise outcome["error"]
+    yield InstallEvent(DONE, results=outcome["results"])
@@ -12,20 +12,41 @@ import json
 import platform
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Callable, Optional
+
+try:
+    from scripts import vscode_extensions
+    from scripts.install_journal import InstallJournal
+    from scripts.extension_catalog import load_catalog
+    from scripts.install_progress import ProgressReporter
+except ImportError:
+    import vscode_extensions
+    from install_journal import InstallJournal
+    from extension_catalog import load_catalog
+    from install_progress import ProgressReporter
 
 class ToolInstaller:
     """Manages the installation of missing tools and application of configurations."""
     
-    def __init__(self, detection_results=None, config_choices=None):
-        """Initialize the installer with detection results and configuration choices."""
+    def __init__(self, detection_results=None, config_choices=None, journal=None):
+        """Initialize the installer with detection results and configuration choices.
+        
+        Install steps are recorded in journal (defaults to the per-user journal).
+        """
         self.detection_results = detection_results or {}
         self.config_choices = config_choices or {}
+        self.journal = journal or InstallJournal("tools")
         self.os_type = platform.system()
         self.repo_base_dir = self._get_repo_base_dir()
     
-    def install_missing_tools(self, tools_to_install: List[str]) -> Dict[str, Any]:
-        """Install missing tools."""
+    def install_missing_tools(self, tools_to_install: List[str],
+                              progress: Optional[Callable] = None) -> Dict[str, Any]:
+        """Install missing tools.
+        
+        Each tool's outcome is recorded in the install journal. progress, if
+        given, is called with an InstallEvent as each tool is queued, started,
+        finished or failed.
+        """
         results = {
             "success": [],
             "failed": []
@@ -35,15 +56,26 @@ class ToolInstaller:
         print("  INSTALLING MISSING TOOLS")
         print("="*60)
         
+        reporter = ProgressReporter(progress)
+        self.journal.begin()
+        self.journal.plan([f"tool:{tool}" for tool in tools_to_install])
+        for tool in tools_to_install:
+            reporter.queued(tool, "tools")
+        
         for tool in tools_to_install:
             print(f"\nInstalling {tool}...")
-            if self._install_tool(tool):
+            reporter.started(tool, "tools")
+            installed = self._install_tool(tool)
+            self.journal.record(f"tool:{tool}", installed)
+            reporter.finished(tool, installed, "tools")
+            if installed:
                 results["success"].append(tool)
                 print(f"  ✓ Successfully installed {tool}")
             else:
                 results["failed"].append(tool)
                 print(f"  ✗ Failed to install {tool}")
         
+        self.journal.finish()
         return results
     
     def apply_configurations(self) -> Dict[str, Any]:
@@ -248,24 +280,23 @@ class ToolInstaller:
                 print("  Recommended extensions file not found")
                 return False
             
-            with open(extensions_file, 'r') as f:
-                extensions_data = json.load(f)
+            catalog = load_catalog(extensions_file)
             
             # Get extensions for the tool
             tool_key = "vscode" if tool == "vscode" or tool == "vscode_insiders" else tool
-            if tool_key not in extensions_data:
+            extensions = [ext["id"] for ext in catalog.by_ide(tool_key)]
+            if not extensions:
                 print(f"  No recommended extensions found for {tool}")
                 return False
             
-            extensions = []
-            for category, exts in extensions_data[tool_key].items():
-                extensions.extend([ext["id"] for ext in exts if "id" in ext])
-            
-            # Install extensions
+            # Install extensions with one CLI call
             cli_cmd = "code" if tool == "vscode" else "code-insiders"
-            for ext_id in extensions:
-                print(f"  Installing extension: {ext_id}")
-                self._run_command(f"{cli_cmd} --install-extension {ext_id}")
+            print(f"  Installing {len(extensions)} extensions")
+            for ext_id, installed in vscode_extensions.install_extensions(cli_cmd, extensions).items():
+                if installed:
+                    print(f"  Installed extension: {ext_id}")
+                else:
+                    print(f"  Failed to install extension: {ext_id}")
             
             return True
         except Exception as e:
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+package_metadata.py - Installed package lookup for Dev Environment Readyifier
+
+This script resolves installed Python distributions through package metadata
+instead of spawning `pip show`. The current interpreter is queried in-process;
+other interpreters (for example conda environments) are queried with a single
+helper process each, covering every requested package at once.
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+from typing import Dict, List, Optional
+
+try:
+    from scripts.detection_profile import note_subprocess
+except ImportError:
+    from detection_profile import note_subprocess
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python < 3.8
+    importlib_metadata = None
+
+# Runs inside the target interpreter: prints {name: version or null} as JSON
+_HELPER_SOURCE = """
+import sys, json
+try:
+    from importlib import metadata
+    def lookup(name):
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return None
+except ImportError:
+    import pkg_resources
+    def lookup(name):
+        try:
+            return pkg_resources.get_distribution(name).version
+        except Exception:
+            return None
+print(json.dumps({name: lookup(name) for name in sys.argv[1:]}))
+"""
+
+
+def get_installed_version(name: str) -> Optional[str]:
+    """Get the installed version of a distribution in the current interpreter."""
+    if importlib_metadata is None:
+        return query_interpreter(sys.executable, [name]).get(name)
+    try:
+        return importlib_metadata.version(name)
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+
+def get_installed_versions(names: List[str]) -> Dict[str, Optional[str]]:
+    """Get installed versions for several distributions in the current interpreter."""
+    return {name: get_installed_version(name) for name in names}
+
+
+def interpreter_for_prefix(prefix: str) -> Optional[str]:
+    """Get the Python executable inside an environment prefix, if it has one."""
+    candidates = [
+        os.path.join(prefix, "python.exe"),
+        os.path.join(prefix, "bin", "python"),
+        os.path.join(prefix, "bin", "python3")
+    ]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def query_interpreter(python: str, names: List[str], timeout: float = 15.0) -> Dict[str, Optional[str]]:
+    """Get installed versions for several distributions in another interpreter."""
+    return query_interpreters([python], names, timeout).get(python, {})
+
+
+def query_interpreters(
+    interpreters: List[str],
+    names: List[str],
+    timeout: float = 15.0
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """Query installed versions in several interpreters.
+
+    One helper process is started per interpreter, covering every package, and
+    all helpers run at the same time under a shared timeout. Interpreters that
+    fail or time out map to an empty dict.
+    """
+    deadline = time.monotonic() + timeout
+    processes = {}
+    for python in interpreters:
+        try:
+            processes[python] = subprocess.Popen(
+                [python, "-c", _HELPER_SOURCE] + list(names),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            note_subprocess()
+        except OSError:
+            pass
+
+    results = {python: {} for python in interpreters}
+    for python, process in processes.items():
+        try:
+            stdout, _ = process.communicate(timeout=max(0.0, deadline - time.monotonic()))
+            if process.returncode == 0:
+                results[python] = json.loads(stdout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+        except ValueError:
+            pass
+
+    return results
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+path_index.py - Executable lookup for Dev Environment Readyifier
+
+This script scans PATH once and answers every executable lookup from an
+in-memory index, instead of spawning `which` for each tool.
+"""
+
+import os
+import platform
+from typing import Dict, List, Optional
+
+
+class PathIndex:
+    """Index of executable names to paths, built from one scan of PATH."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the index for a PATH string (defaults to the PATH environment variable)."""
+        self.path = os.environ.get("PATH", "") if path is None else path
+        self.is_windows = platform.system() == "Windows"
+        self.extensions = [""]
+        if self.is_windows:
+            # Windows only runs files with a PATHEXT extension, so a bare name is never tried
+            self.extensions = [ext.lower() for ext in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(";") if ext]
+        self._index: Optional[Dict[str, List[str]]] = None
+
+    def _build(self) -> Dict[str, List[str]]:
+        """Scan every PATH directory once, keeping candidates in PATH order."""
+        index: Dict[str, List[str]] = {}
+        for directory in self.path.split(os.pathsep):
+            if not directory:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name.lower() if self.is_windows else entry.name
+                        index.setdefault(name, []).append(entry.path)
+            except OSError:
+                continue
+        return index
+
+    def which(self, name: str) -> Optional[str]:
+        """Get the path of the first executable called name on PATH, like `which`."""
+        if self._index is None:
+            self._index = self._build()
+
+        key = name.lower() if self.is_windows else name
+        extensions = self.extensions
+        if self.is_windows and any(key.endswith(ext) for ext in extensions):
+            # A name that already has an executable extension (e.g. "code.cmd") is looked up as is
+            extensions = [""]
+        for ext in extensions:
+            # Executable bits are only checked for the names actually looked up
+            for candidate in self._index.get(key + ext, []):
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    return candidate
+        return None
+
+
+_shared_index: Optional[PathIndex] = None
+
+
+def get_path_index() -> PathIndex:
+    """Get the shared index for the current PATH, rebuilding it if PATH changed."""
+    global _shared_index
+    if _shared_index is None or _shared_index.path != os.environ.get("PATH", ""):
+        _shared_index = PathIndex()
+    return _shared_index
+
+
+def reset_path_index():
+    """Forget the shared index, e.g. after executables were added to or removed from PATH."""
+    global _shared_index
+    _shared_index = None
+
+
+def which(name: str) -> Optional[str]:
+    """Look up an executable in the shared PATH index."""
+    return get_path_index().which(name)
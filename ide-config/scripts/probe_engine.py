@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+probe_engine.py - Generic tool probing for Dev Environment Readyifier
+
+This script runs the declarative probe catalog (see PROBE_CATALOG in
+detector.py) through one engine. Shared work is done once per engine: a single
+PATH index, one memoized extension list per VS Code profile, and one metadata
+lookup covering every package in the catalog. Adding a tool to the catalog
+therefore adds no extra subprocesses beyond its own version command.
+"""
+
+import os
+import glob
+import importlib
+import platform
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+try:
+    from scripts import package_metadata
+    from scripts import vscode_extensions
+    from scripts import wsl
+    from scripts.path_index import get_path_index, reset_path_index
+    from scripts.subprocess_engine import run_command, run_blocking
+    from scripts.detection_profile import note_cache_hit, note_subprocess, note_command_timeout
+except ImportError:
+    import package_metadata
+    import vscode_extensions
+    import wsl
+    from path_index import get_path_index, reset_path_index
+    from subprocess_engine import run_command, run_blocking
+    from detection_profile import note_cache_hit, note_subprocess, note_command_timeout
+
+
+# Fraction of the probe timeout a tool's version command may take
+VERSION_TIMEOUT_SHARE = 0.5
+
+
+def expand_path(path: str) -> Optional[str]:
+    """Expand {home}, Windows and WSL directory placeholders in a catalog path.
+
+    Returns None if the path uses a WSL placeholder that cannot be resolved.
+    """
+    replacements = {
+        "{home}": str(Path.home()),
+        "{ProgramFiles}": os.environ.get("ProgramFiles", "C:\\Program Files"),
+        "{ProgramFiles(x86)}": os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"),
+        "{LOCALAPPDATA}": os.environ.get("LOCALAPPDATA", "C:\\Users\\User\\AppData\\Local")
+    }
+    if "{Windows" in path:
+        replacements.update({"{" + name + "}": value for name, value in wsl.windows_dirs().items()})
+    for placeholder, value in replacements.items():
+        path = path.replace(placeholder, value)
+    return None if "{Windows" in path else path
+
+
+class ProbeEngine:
+    """Runs catalog probes, sharing PATH, extension and package lookups across tools."""
+
+    def __init__(self, catalog: Dict[str, Dict[str, Any]], os_type: Optional[str] = None, timeout: float = 15.0):
+        """Initialize the engine.
+
+        Args:
+            catalog: Probe catalog mapping tool name to its probe description
+            os_type: platform.system() value to probe for (defaults to the current OS)
+            timeout: Seconds a version command may take
+        """
+        self.catalog = catalog
+        self.os_type = os_type or platform.system()
+        self.timeout = timeout
+        self.path_index = get_path_index()
+        self._packages: Optional[Dict[str, Optional[str]]] = None
+        self._lock = threading.Lock()
+
+    def clear_memo(self):
+        """Forget memoized PATH, package, extension and Windows-side lookups, e.g. after installing."""
+        with self._lock:
+            self._packages = None
+        importlib.invalidate_caches()
+        reset_path_index()
+        self.path_index = get_path_index()
+        vscode_extensions.clear_memo()
+        wsl.clear_memo()
+
+    def _paths(self, tool: str, key: str) -> List[str]:
+        """Get a tool's catalog paths under key for this OS and for all OSes."""
+        spec = self.catalog[tool].get(key, {})
+        paths = spec.get("all", []) + spec.get(self.os_type, [])
+        if self.os_type == "Linux" and wsl.is_wsl():
+            paths = paths + spec.get("WSL", [])
+        return [path for path in map(expand_path, paths) if path]
+
+    def _first_existing(self, paths: List[str]) -> Optional[str]:
+        """Get the first path that exists, expanding wildcards."""
+        for path in paths:
+            if "*" in path:
+                for match in glob.glob(path):
+                    return match
+            elif wsl.path_exists(path):
+                return path
+        return None
+
+    def concrete_paths(self, tool: str) -> List[str]:
+        """Get a tool's concrete (wildcard-free) install and CLI paths."""
+        return [
+            path for key in ("install_paths", "cli_paths")
+            for path in self._paths(tool, key) if "*" not in path
+        ]
+
+    def fingerprint_paths(self) -> List[str]:
+        """Get every concrete catalog path, for cache fingerprints."""
+        paths = []
+        for tool in self.catalog:
+            paths.extend(self.concrete_paths(tool))
+        return paths
+
+    def package_versions(self) -> Dict[str, Optional[str]]:
+        """Get versions of every catalog package in one metadata pass."""
+        with self._lock:
+            if self._packages is None:
+                names = sorted({name for spec in self.catalog.values() for name in spec.get("packages", [])})
+                self._packages = package_metadata.get_installed_versions(names)
+            else:
+                note_cache_hit()
+            return self._packages
+
+    def installed_package(self, tool: str) -> Optional[str]:
+        """Get the first of a tool's packages that is installed."""
+        versions = self.package_versions()
+        for name in self.catalog[tool].get("packages", []):
+            if versions.get(name):
+                return name
+        return None
+
+    def find_executable(self, tool: str) -> Optional[str]:
+        """Find one of a tool's executables on PATH."""
+        for name in self.catalog[tool].get("executables", []):
+            path = self.path_index.which(name)
+            if path:
+                return path
+        return None
+
+    def find_install(self, tool: str) -> Optional[str]:
+        """Find where a tool is installed: an install path, a pip package, an executable on PATH or a VS Code extension."""
+        path = self._first_existing(self._paths(tool, "install_paths"))
+        if path:
+            return path
+        package = self.installed_package(tool)
+        if package:
+            return f"pip:{package}"
+        path = self.find_executable(tool)
+        if path:
+            return path
+        extension = self.installed_extension(tool)
+        if extension:
+            # The extension folder, unless the list came from the CLI
+            return extension["path"] or f"extension:{extension['id']}"
+        return None
+
+    def find_cli(self, tool: str) -> Optional[str]:
+        """Find a tool's command-line entry point: a known CLI path or an executable on PATH."""
+        return self._first_existing(self._paths(tool, "cli_paths")) or self.find_executable(tool)
+
+    def installed_extensions(self, profile: str) -> List[Dict[str, Any]]:
+        """Get installed extensions for a VS Code profile (memoized per profile)."""
+        return vscode_extensions.list_extensions(profile, self.find_cli(profile), self.timeout)
+
+    def installed_extension(self, tool: str) -> Optional[Dict[str, Any]]:
+        """Get the first of an extension-based tool's extensions that is installed."""
+        for profile, ids in self.catalog[tool].get("extension_ids", {}).items():
+            wanted = {ext_id.lower() for ext_id in ids}
+            for ext in self.installed_extensions(profile):
+                if ext["id"].lower() in wanted:
+                    return ext
+        return None
+
+    def has_extension(self, tool: str) -> bool:
+        """Check whether any of an extension-based tool's extensions is installed."""
+        return self.installed_extension(tool) is not None
+
+    def _version_command(self, tool: str) -> Optional[List[str]]:
+        """Get the command that prints a tool's version, if it has one and a CLI was found."""
+        args = self.catalog[tool].get("version_args")
+        cli = self.find_cli(tool) if args else None
+        return [cli] + args if cli else None
+
+    @staticmethod
+    def _parse_version(returncode: Optional[int], stdout: str) -> Optional[str]:
+        """Get the version from a version command's output."""
+        if returncode == 0 and stdout.strip():
+            # First line of output is the version
+            return stdout.strip().split("\n")[0]
+        return None
+
+    def _extension_version(self, tool: str) -> str:
+        """Get the version of a tool's installed extension, or "Unknown"."""
+        extension = self.installed_extension(tool)
+        return extension["version"] if extension else "Unknown"
+
+    def version(self, tool: str) -> str:
+        """Get a tool's version from its package metadata, its version command or its extension."""
+        package = self.installed_package(tool)
+        if package:
+            return self.package_versions()[package]
+
+        command = self._version_command(tool)
+        if command:
+            try:
+                note_subprocess()
+                result = subprocess.run(
+                    command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    timeout=self.timeout
+                )
+                return self._parse_version(result.returncode, result.stdout) or "Unknown"
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        return self._extension_version(tool)
+
+    async def version_async(self, tool: str) -> str:
+        """Async version of version, running the version command as an asyncio subprocess."""
+        package = self.installed_package(tool)
+        if package:
+            return self.package_versions()[package]
+
+        command = self._version_command(tool)
+        if command:
+            # A share of the probe's budget, so a hung CLI costs the version, not the whole probe
+            result = await run_command(command, self.timeout * VERSION_TIMEOUT_SHARE)
+            if result.timed_out:
+                note_command_timeout()
+            return self._parse_version(result.returncode, result.stdout) or "Unknown"
+        return await run_blocking(self._extension_version, tool)
+
+    def probe(self, tool: str) -> Optional[Dict[str, str]]:
+        """Probe one tool, returning its path and version or None if it is not installed."""
+        path = self.find_install(tool)
+        if not path:
+            return None
+        return {"version": self.version(tool), "path": path}
+
+    async def probe_async(self, tool: str) -> Optional[Dict[str, str]]:
+        """Async version of probe; filesystem lookups run on the runner's thread pool.
+
+        A version command that times out leaves the version "Unknown" but the
+        tool is still reported at its path.
+        """
+        path = await run_blocking(self.find_install, tool)
+        if not path:
+            return None
+        return {"version": await self.version_async(tool), "path": path}
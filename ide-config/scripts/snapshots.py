@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+snapshots.py - Environment snapshots and diffs for Dev Environment Readyifier
+
+This script stores compact, versioned snapshots of detection results (tools and
+their versions, VS Code extensions, conda environments) and reports what was
+added, removed or changed between two snapshots, so later stages can act on the
+delta instead of redoing everything. A snapshot can also carry the missing
+extensions computed for it, which the next run reuses for unchanged environments.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+from typing import Dict, List, Any, Optional, Set
+
+try:
+    from scripts.detection_cache import default_cache_dir
+except ImportError:
+    from detection_cache import default_cache_dir
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Detection result sections holding tools
+TOOL_SECTIONS = ("ides", "ai_tools")
+
+
+def default_snapshot_dir() -> str:
+    """Get the per-user snapshot directory."""
+    return os.path.join(default_cache_dir(), "snapshots")
+
+
+def file_digest(path: str) -> Optional[str]:
+    """Get the SHA-256 of a file, e.g. the recommended extensions configuration."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def compact(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a snapshot from detection results."""
+    tools = {}
+    for section in TOOL_SECTIONS:
+        for tool, info in (results.get(section) or {}).items():
+            tools[tool] = {"version": info.get("version"), "path": info.get("path")}
+
+    return {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "taken_at": time.time(),
+        "os": results.get("os_info", {}),
+        "tools": tools,
+        "extensions": {ext["id"]: ext.get("version") for ext in results.get("vscode_extensions") or [] if ext.get("id")},
+        "conda_environments": {env["path"]: env.get("name") for env in results.get("conda_environments") or []}
+    }
+
+
+def _diff_section(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Diff one snapshot section keyed by name."""
+    return {
+        "added": {name: new[name] for name in sorted(new.keys() - old.keys())},
+        "removed": {name: old[name] for name in sorted(old.keys() - new.keys())},
+        "changed": {
+            name: {"from": old[name], "to": new[name]}
+            for name in sorted(old.keys() & new.keys()) if old[name] != new[name]
+        }
+    }
+
+
+def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Report tools, extensions and conda environments added, removed or changed from old to new."""
+    return {
+        section: _diff_section(old.get(section) or {}, new.get(section) or {})
+        for section in ("tools", "extensions", "conda_environments")
+    }
+
+
+def is_empty(delta: Dict[str, Dict[str, Any]]) -> bool:
+    """Check whether a diff found no changes."""
+    return not any(changes for section in delta.values() for changes in section.values())
+
+
+def changed_environments(delta: Dict[str, Dict[str, Any]]) -> Set[str]:
+    """Get the tools a diff touches; a VS Code extension change counts as a change to "vscode"."""
+    changed = set()
+    for changes in delta["tools"].values():
+        changed.update(changes)
+    if any(delta["extensions"].values()):
+        changed.add("vscode")
+    return changed
+
+
+def format_diff(delta: Dict[str, Dict[str, Any]]) -> str:
+    """Render a diff as readable lines."""
+    if is_empty(delta):
+        return "No changes."
+
+    labels = {"tools": "Tool", "extensions": "Extension", "conda_environments": "Conda environment"}
+    lines = []
+    for section, label in labels.items():
+        changes = delta[section]
+        for name, value in changes["added"].items():
+            version = value.get("version") if isinstance(value, dict) else value
+            lines.append(f"+ {label} {name}" + (f" {version}" if version and section != "conda_environments" else ""))
+        for name, value in changes["removed"].items():
+            lines.append(f"- {label} {name}")
+        for name, change in changes["changed"].items():
+            old, new = change["from"], change["to"]
+            if isinstance(old, dict):
+                old, new = old.get("version"), new.get("version")
+            lines.append(f"~ {label} {name}: {old} -> {new}")
+    return "\n".join(lines)
+
+
+class SnapshotStore:
+    """Keeps the most recent snapshots as small JSON files."""
+
+    def __init__(self, directory: Optional[str] = None, keep: int = 20):
+        """Initialize the store.
+
+        Args:
+            directory: Directory snapshots are kept in (defaults to the per-user cache directory)
+            keep: Number of snapshots to keep; older ones are deleted
+        """
+        self.directory = directory or default_snapshot_dir()
+        self.keep = keep
+
+    def names(self) -> List[str]:
+        """Get stored snapshot names, oldest first."""
+        try:
+            return sorted(
+                name[:-len(".json")] for name in os.listdir(self.directory)
+                if name.startswith("snapshot-") and name.endswith(".json")
+            )
+        except OSError:
+            return []
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Load a snapshot by name, or None if it is missing, unreadable or of another format."""
+        try:
+            with open(os.path.join(self.directory, f"{name}.json"), 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("format") != SNAPSHOT_FORMAT_VERSION:
+            return None
+        return snapshot
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Load the most recent snapshot."""
+        names = self.names()
+        return self.load(names[-1]) if names else None
+
+    def save(self, snapshot: Dict[str, Any]) -> str:
+        """Store a snapshot and delete the oldest beyond the limit.
+
+        Returns:
+            The snapshot's name
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        name = time.strftime("snapshot-%Y%m%d-%H%M%S", time.localtime(snapshot["taken_at"]))
+        name += f"-{int(snapshot['taken_at'] * 1000) % 1000:03d}"
+
+        path = os.path.join(self.directory, f"{name}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+        for old in self.names()[:-self.keep]:
+            try:
+                os.remove(os.path.join(self.directory, f"{old}.json"))
+            except OSError:
+                pass
+        return name
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="List and diff environment snapshots")
+    parser.add_argument("--dir", help="Snapshot directory (defaults to the per-user cache directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List stored snapshots")
+
+    diff_parser = commands.add_parser("diff", help="Show changes between two snapshots")
+    diff_parser.add_argument("old", nargs="?", help="Older snapshot (defaults to the second most recent)")
+    diff_parser.add_argument("new", nargs="?", help="Newer snapshot (defaults to the most recent)")
+    diff_parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+
+    args = parser.parse_args(argv)
+    store = SnapshotStore(args.dir)
+    names = store.names()
+
+    if args.command == "list":
+        for name in names:
+            print(name)
+        return
+
+    if not args.old and len(names) < 2:
+        print("At least two snapshots are needed to diff.")
+        sys.exit(1)
+    old_name = args.old or names[-2]
+    new_name = args.new or names[-1]
+    old, new = store.load(old_name), store.load(new_name)
+    if old is None or new is None:
+        print(f"Snapshot not found: {old_name if old is None else new_name}")
+        sys.exit(1)
+
+    delta = diff(old, new)
+    print(json.dumps(delta, indent=2) if args.json else format_diff(delta))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
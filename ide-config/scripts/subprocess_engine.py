@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+subprocess_engine.py - Async subprocess and probe execution for Dev Environment Readyifier
+
+This script runs detection probes on asyncio. Commands are started with asyncio
+subprocesses so a hung CLI (for example `code --version` waiting on a missing
+display) is killed at its deadline instead of stalling setup. Probes run under
+a per-probe timeout and a global deadline; probes that miss either are
+cancelled, reported as timed out, and replaced by their default value.
+Blocking work runs on daemon threads the runner owns and never waits for, so a
+stuck filesystem call can hold neither a run past its global deadline nor the
+interpreter at exit.
+"""
+
+import os
+import signal
+import asyncio
+import queue
+import functools
+import threading
+import contextvars
+from concurrent.futures import Executor, Future
+from typing import Dict, List, Any, Optional, Callable, Tuple, NamedTuple
+
+try:
+    from scripts.detection_profile import DetectionProfiler, measure, note_subprocess
+except ImportError:
+    from detection_profile import DetectionProfiler, measure, note_subprocess
+
+# Thread pool of the ProbeRunner running the current probe
+_current_executor: contextvars.ContextVar = contextvars.ContextVar("current_probe_executor", default=None)
+
+
+class CommandResult(NamedTuple):
+    """Outcome of a command run by run_command."""
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+
+
+def _kill(process: asyncio.subprocess.Process):
+    """Kill a process and, on POSIX, everything it started; it may already have exited."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_command(args: List[str], timeout: Optional[float] = None) -> CommandResult:
+    """Run a command without a shell and collect its output.
+
+    The process is killed if it outlives the timeout or the calling task is cancelled.
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own process group, so wrapper scripts and their children die together
+            start_new_session=(os.name == "posix")
+        )
+    except OSError as e:
+        return CommandResult(None, "", str(e))
+    note_subprocess()
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        _kill(process)
+        await process.wait()
+        return CommandResult(None, "", "", timed_out=True)
+    except asyncio.CancelledError:
+        _kill(process)
+        await process.wait()
+        raise
+
+    return CommandResult(
+        process.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace")
+    )
+
+
+class DaemonThreadPool(Executor):
+    """Thread pool whose workers are daemon threads.
+
+    Unlike ThreadPoolExecutor, whose workers the interpreter joins at exit, a
+    call that never returns (e.g. a stat on a wedged network mount) does not
+    keep the process alive once the main thread is done. Workers are started
+    as work arrives, up to max_workers.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """Initialize the pool."""
+        self.max_workers = max_workers
+        self._work: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule fn(*args, **kwargs) and return its future."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new work after shutdown")
+            future: Future = Future()
+            self._work.put((future, fn, args, kwargs))
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, name="probe-worker", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _worker(self):
+        """Run queued work until shutdown."""
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            # Work cancelled while queued (e.g. a probe past its deadline) is dropped
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        """Stop the workers once they finish their current work; with wait, join them."""
+        with self._lock:
+            self._shutdown = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._work.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+async def run_blocking(func: Callable[..., Any], *args) -> Any:
+    """Run a blocking function from an async probe on its runner's thread pool.
+
+    Outside a ProbeRunner the event loop's default thread pool is used.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_current_executor.get(), functools.partial(context.run, func, *args))
+
+
+# A probe is either an async function or a plain function run on the thread pool
+Probe = Tuple[Callable[[], Any], Any]
+
+
+class ProbeRunner:
+    """Runs probes concurrently under per-probe and global deadlines."""
+
+    def __init__(
+        self,
+        probe_timeout: float = 15.0,
+        global_timeout: float = 30.0,
+        max_workers: int = 8,
+        profiler: Optional[DetectionProfiler] = None,
+        component: str = "detector"
+    ):
+        """Initialize the runner.
+
+        Args:
+            probe_timeout: Seconds each probe may take
+            global_timeout: Seconds the whole run may take
+            max_workers: Threads available to plain (non-async) probes
+            profiler: Profiler to record each probe in (optional)
+            component: Component name the probes are recorded under
+        """
+        self.probe_timeout = probe_timeout
+        self.global_timeout = global_timeout
+        self.max_workers = max_workers
+        self.profiler = profiler
+        self.component = component
+
+    def run(self, probes: Dict[str, Probe]) -> Tuple[Dict[str, Any], List[str]]:
+        """Run probes and wait for them, returning (results, names of probes that timed out).
+
+        Args:
+            probes: Mapping of probe name to (function, default). The default is
+                used when the probe raises, times out or is cancelled.
+        """
+        return asyncio.run(self.run_async(probes))
+
+    async def run_async(self, probes: Dict[str, Probe]) -> Tuple[Dict[str, Any], List[str]]:
+        """Async version of run, for callers already inside an event loop."""
+        loop = asyncio.get_running_loop()
+        executor = DaemonThreadPool(max_workers=self.max_workers)
+        # Async probes reach the pool through run_blocking; tasks copy this context
+        token = _current_executor.set(executor)
+
+        async def _call(name: str, func: Callable[[], Any]) -> Any:
+            with measure(self.profiler, name, self.component):
+                if asyncio.iscoroutinefunction(func):
+                    return await func()
+                # Carry the probe's profiling context into the worker thread
+                context = contextvars.copy_context()
+                return await loop.run_in_executor(executor, context.run, func)
+
+        tasks = {
+            name: asyncio.ensure_future(asyncio.wait_for(_call(name, func), self.probe_timeout))
+            for name, (func, _) in probes.items()
+        }
+        _current_executor.reset(token)
+        try:
+            if tasks:
+                await asyncio.wait(tasks.values(), timeout=self.global_timeout)
+        finally:
+            # Don't block on plain probes that overran; their own timeouts reap them
+            executor.shutdown(wait=False)
+
+        results = {}
+        timed_out = []
+        for name, task in tasks.items():
+            default = probes[name][1]
+            if not task.done():
+                # Missed the global deadline
+                task.cancel()
+                timed_out.append(name)
+                results[name] = default
+            elif task.cancelled():
+                timed_out.append(name)
+                results[name] = default
+            elif isinstance(task.exception(), asyncio.TimeoutError):
+                timed_out.append(name)
+                results[name] = default
+            elif task.exception() is not None:
+                results[name] = default
+            else:
+                results[name] = task.result()
+
+        # Let cancelled tasks kill their subprocesses before the loop closes
+        pending = [task for task in tasks.values() if not task.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=1.0)
+
+        if self.profiler:
+            self.profiler.mark_timed_out(timed_out, self.component)
+        return results, timed_out
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+vscode_extensions.py - Installed VS Code extension listing for Dev Environment Readyifier
+
+This script reads installed extensions for VS Code and VS Code Insiders straight
+from the profile's extensions folder (the extensions.json manifest and each
+extension's package.json), instead of starting the Electron-based `code` CLI.
+The CLI is only used when the folder does not exist, and results are memoized
+per profile until the folder changes.
+
+Extensions are installed in batches: one CLI start with many
+`--install-extension` arguments, with the combined output parsed per extension.
+"""
+
+import os
+import re
+import json
+import signal
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
+
+try:
+    from scripts.detection_profile import note_cache_hit, note_subprocess
+    from scripts.extension_graph import bundled_ids
+except ImportError:
+    from detection_profile import note_cache_hit, note_subprocess
+    from extension_graph import bundled_ids
+
+# CLI and default extensions folder for each VS Code profile
+PROFILES = {
+    "vscode": {"cli": "code", "folder": ".vscode"},
+    "vscode_insiders": {"cli": "code-insiders", "folder": ".vscode-insiders"}
+}
+
+# Per-extension lines of `code --install-extension` output
+_INSTALLED = re.compile(r"Extension '([^']+)'(?: v\S+)? (?:was successfully installed|is already installed)", re.IGNORECASE)
+_NOT_FOUND = re.compile(r"Extension '([^']+)' not found", re.IGNORECASE)
+_FAILED_LIST = re.compile(r"Failed Installing Extensions: (.+)", re.IGNORECASE)
+
+_memo: Dict[Tuple[str, str], Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+_memo_lock = threading.Lock()
+
+
+def profile_for_cli(cli_path: Optional[str]) -> str:
+    """Guess the profile a `code` CLI path belongs to."""
+    return "vscode_insiders" if cli_path and "insiders" in cli_path.lower() else "vscode"
+
+
+def extensions_dir(profile: str = "vscode") -> str:
+    """Get the extensions folder for a profile."""
+    if profile == "vscode" and os.environ.get("VSCODE_EXTENSIONS"):
+        return os.environ["VSCODE_EXTENSIONS"]
+    return os.path.join(str(Path.home()), PROFILES[profile]["folder"], "extensions")
+
+
+def _stamp(directory: str) -> Tuple[int, int]:
+    """Get the mtimes that change whenever extensions are installed or removed."""
+    stamps = []
+    for path in (directory, os.path.join(directory, "extensions.json")):
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(0)
+    return stamps[0], stamps[1]
+
+
+def _read_json(path: str) -> Any:
+    """Read a JSON file, returning None if it is missing or invalid."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_manifest(extension_path: str) -> Optional[Dict[str, Any]]:
+    """Read an installed extension's package.json manifest."""
+    manifest = _read_json(os.path.join(extension_path, "package.json"))
+    if not isinstance(manifest, dict) or "publisher" not in manifest or "name" not in manifest:
+        return None
+    return manifest
+
+
+def _record(manifest: Dict[str, Any], extension_path: str) -> Dict[str, Any]:
+    """Build an extension record from a manifest."""
+    return {
+        "id": f"{manifest['publisher']}.{manifest['name']}",
+        "version": manifest.get("version", "Unknown"),
+        "name": manifest["name"],
+        "path": extension_path,
+        # Extensions its pack and dependencies install with it
+        "bundled": bundled_ids(manifest)
+    }
+
+
+def _extension_paths(directory: str) -> List[str]:
+    """Get installed extension folders, preferring the extensions.json manifest."""
+    # Folders VS Code has uninstalled but not yet deleted
+    obsolete = _read_json(os.path.join(directory, ".obsolete")) or {}
+
+    entries = _read_json(os.path.join(directory, "extensions.json"))
+    if isinstance(entries, list):
+        paths = []
+        for entry in entries:
+            relative = entry.get("relativeLocation")
+            location = entry.get("location") or {}
+            if relative:
+                path = os.path.join(directory, relative)
+            else:
+                path = location.get("fsPath") or location.get("path")
+            if path and os.path.basename(path) not in obsolete:
+                paths.append(path)
+        return paths
+
+    try:
+        with os.scandir(directory) as it:
+            return [
+                entry.path for entry in it
+                if entry.is_dir() and not entry.name.startswith(".") and entry.name not in obsolete
+            ]
+    except OSError:
+        return []
+
+
+def _read_from_disk(directory: str) -> List[Dict[str, Any]]:
+    """List installed extensions from an extensions folder."""
+    extensions = []
+    for path in _extension_paths(directory):
+        manifest = read_manifest(path)
+        if manifest:
+            extensions.append(_record(manifest, path))
+    return extensions
+
+
+def _read_from_cli(cli_path: str, timeout: float) -> List[Dict[str, Any]]:
+    """List installed extensions with `code --list-extensions --show-versions`."""
+    extensions = []
+    try:
+        note_subprocess()
+        result = subprocess.run(
+            [cli_path, "--list-extensions", "--show-versions"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return extensions
+
+    if result.returncode == 0:
+        for line in result.stdout.strip().split("\n"):
+            if line:
+                ext_id, _, version = line.partition("@")
+                extensions.append({
+                    "id": ext_id,
+                    "version": version or "Unknown",
+                    "name": ext_id.split(".")[-1],
+                    "path": None,
+                    "bundled": []
+                })
+    return extensions
+
+
+def list_extensions(
+    profile: str = "vscode",
+    cli_path: Optional[str] = None,
+    timeout: float = 15.0
+) -> List[Dict[str, Any]]:
+    """List installed extensions for a VS Code profile.
+
+    Args:
+        profile: "vscode" or "vscode_insiders"
+        cli_path: CLI to fall back to when the extensions folder is missing
+        timeout: Seconds the CLI fallback may take
+
+    Returns:
+        Extension records with id, version, name, path (None when read from the
+        CLI) and bundled (lowercased IDs of its extensionPack and
+        extensionDependencies; empty when read from the CLI)
+    """
+    directory = extensions_dir(profile)
+    key = (profile, directory)
+    stamp = _stamp(directory)
+
+    with _memo_lock:
+        cached = _memo.get(key)
+    if cached and cached[0] == stamp:
+        note_cache_hit()
+        return list(cached[1])
+
+    if os.path.isdir(directory):
+        extensions = _read_from_disk(directory)
+    elif cli_path:
+        extensions = _read_from_cli(cli_path, timeout)
+    else:
+        extensions = []
+
+    with _memo_lock:
+        _memo[key] = (stamp, extensions)
+    return list(extensions)
+
+
+def clear_memo():
+    """Forget memoized extension lists, e.g. after installing through the CLI."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _output_key(item: str) -> str:
+    """Get how the CLI names an extension ID or .vsix path in its output."""
+    item = item.strip().lower()
+    # Packages are reported by file name
+    if item.endswith(".vsix"):
+        return os.path.basename(item.replace("\\", "/"))
+    # Versioned requests (publisher.name@1.2.3) are reported by ID
+    return item.partition("@")[0]
+
+
+def parse_install_output(output: str) -> Tuple[Set[str], Set[str]]:
+    """Get the IDs and .vsix file names reported as installed and as failed in CLI install output."""
+    installed = {_output_key(match) for match in _INSTALLED.findall(output)}
+    failed = {_output_key(match) for match in _NOT_FOUND.findall(output)}
+    for match in _FAILED_LIST.findall(output):
+        failed.update(_output_key(item) for item in match.split(",") if item.strip())
+    return installed, failed - installed
+
+
+def _run_install(
+    cli_path: str,
+    extension_ids: List[str],
+    timeout: float,
+    force: bool = False,
+    on_line: Optional[Callable[[str], None]] = None
+) -> Tuple[Optional[int], str]:
+    """Run one CLI install for a batch of extensions, returning (exit code, combined output).
+
+    Output is read as the CLI writes it and passed to on_line one line at a time.
+    """
+    args = [cli_path]
+    for ext_id in extension_ids:
+        args.extend(["--install-extension", ext_id])
+    if force:
+        args.append("--force")
+    try:
+        process = subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            start_new_session=(os.name == "posix")
+        )
+    except OSError as e:
+        return None, str(e)
+
+    # The CLI, and on POSIX everything it started, is killed once it runs past the timeout
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    lines = []
+    try:
+        for line in process.stdout:
+            lines.append(line)
+            if on_line is not None:
+                on_line(line)
+        process.wait()
+    finally:
+        timer.cancel()
+        process.stdout.close()
+
+    if timed_out.is_set():
+        return None, "".join(lines) + f"\nTimed out after {timeout} seconds"
+    return process.returncode, "".join(lines)
+
+
+def install_extensions(
+    cli_path: str,
+    extension_ids: List[str],
+    timeout: float = 600.0,
+    force: bool = False,
+    on_result: Optional[Callable[[str, bool], None]] = None
+) -> Dict[str, bool]:
+    """Install extensions with as few CLI starts as possible.
+
+    All extensions are passed to one CLI call and the output is parsed per
+    extension. When the call fails, extensions the output does not account for
+    are retried: together if some were accounted for, otherwise split in half,
+    until each failing extension is isolated.
+
+    Args:
+        cli_path: `code` or `code-insiders` CLI
+        extension_ids: Extensions to install, as marketplace IDs (optionally
+            with @version) or .vsix paths
+        timeout: Seconds one CLI call may take
+        force: Replace installed extensions with the requested version
+        on_result: Called with each ID or path and whether it was installed,
+            as soon as the CLI output reports it
+
+    Returns:
+        Mapping of each given ID or path to whether it is now installed
+    """
+    results: Dict[str, bool] = {}
+    reported: Set[str] = set()
+
+    def report(ext_id: str, success: bool):
+        if on_result is not None and ext_id not in reported:
+            reported.add(ext_id)
+            on_result(ext_id, success)
+
+    batches = [list(dict.fromkeys(extension_ids))]
+    while batches:
+        batch = batches.pop()
+        if not batch:
+            continue
+
+        def on_line(line: str, batch: List[str] = batch):
+            line_installed, line_failed = parse_install_output(line)
+            for ext_id in batch:
+                key = _output_key(ext_id)
+                if key in line_installed or key in line_failed:
+                    report(ext_id, key in line_installed)
+
+        returncode, output = _run_install(cli_path, batch, timeout, force, on_line)
+        installed, failed = parse_install_output(output)
+
+        unresolved = []
+        for ext_id in batch:
+            key = _output_key(ext_id)
+            if key in installed:
+                results[ext_id] = True
+            elif key in failed:
+                results[ext_id] = False
+            elif returncode == 0:
+                # Older CLIs print nothing per extension on success
+                results[ext_id] = True
+            else:
+                unresolved.append(ext_id)
+
+        if len(unresolved) == 1:
+            results[unresolved[0]] = False
+        elif len(unresolved) < len(batch):
+            batches.append(unresolved)
+        elif unresolved:
+            middle = len(unresolved) // 2
+            batches.extend([unresolved[middle:], unresolved[:middle]])
+
+        # Outcomes the output did not report line by line
+        for ext_id in batch:
+            if ext_id in results:
+                report(ext_id, results[ext_id])
+
+    if results:
+        clear_memo()
+    return {ext_id: results[ext_id] for ext_id in dict.fromkeys(extension_ids)}
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+vsix_cache.py - Local VSIX store for Dev Environment Readyifier
+
+This script keeps VS Code extension packages (.vsix files) in a local,
+content-addressed store: each file is stored once under its SHA-256 and
+indexed by extension ID and version, read from the package's own manifest.
+The store has a size cap; the least recently used packages are evicted first.
+ExtensionManager installs from the store with `--install-extension <path.vsix>`
+when it holds the extension, so provisioning runs and air-gapped hosts do not
+download it again. The store is pre-seeded from a directory of .vsix files.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from scripts.detection_cache import default_cache_dir
+    from scripts.extension_graph import bundled_ids
+except ImportError:
+    from detection_cache import default_cache_dir
+    from extension_graph import bundled_ids
+
+INDEX_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+_NUMERIC_VERSION = re.compile(r"^\d+(\.\d+)*(-[0-9A-Za-z.-]+)?(\+[0-9A-Za-z.-]+)?$")
+
+
+def default_vsix_dir() -> str:
+    """Get the per-user VSIX store directory."""
+    return os.path.join(default_cache_dir(), "vsix")
+
+
+def _version_parts(text: str) -> List[Tuple]:
+    """Split dotted version text into parts that compare numbers numerically and before words."""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in text.split(".") if part]
+
+
+def version_key(version: str) -> Tuple:
+    """Get a sort key that orders dotted versions numerically (1.10.0 after 1.9.2, 1.0 equal to 1.0.0).
+
+    A pre-release sorts below its release (1.2.0-beta before 1.2.0); build
+    metadata after "+" is ignored.
+    """
+    release, _, prerelease = version.strip().split("+")[0].partition("-")
+    parts = _version_parts(release)
+    while parts and parts[-1] == (0, 0, ""):
+        parts.pop()
+    return tuple(parts), ((0, tuple(_version_parts(prerelease))) if prerelease else (1,))
+
+
+def is_numeric_version(version: Optional[str]) -> bool:
+    """Check whether a version has a numeric release (e.g. "1.2.0" or "1.2.0-beta", not "Unknown")."""
+    return bool(version) and bool(_NUMERIC_VERSION.match(version.strip()))
+
+
+def read_vsix_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """Read the package.json inside a .vsix, returning None if it is not a valid package."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read("extension/package.json").decode("utf-8"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if not isinstance(manifest, dict) or not all(manifest.get(key) for key in ("publisher", "name", "version")):
+        return None
+    return manifest
+
+
+def file_sha256(path: str) -> str:
+    """Get the SHA-256 of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VsixCache:
+    """Content-addressed store of .vsix packages with a least-recently-used size cap."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the store.
+
+        Args:
+            directory: Store directory (defaults to the per-user cache directory)
+            max_bytes: Total size of stored packages above which the least recently used are evicted
+        """
+        self.directory = directory or default_vsix_dir()
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.directory, "index.json")
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+
+    def _object_path(self, sha256: str) -> str:
+        """Get where the package with a digest is stored."""
+        return os.path.join(self.directory, "objects", sha256[:2], f"{sha256}.vsix")
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Load the index of extension ID -> version -> entry."""
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as f:
+                    data = json.load(f)
+                self._index = data["extensions"] if data.get("format") == INDEX_FORMAT_VERSION else {}
+            except (OSError, ValueError, KeyError):
+                self._index = {}
+        return self._index
+
+    def _save(self):
+        """Write the index atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"format": INDEX_FORMAT_VERSION, "extensions": self._index}, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def add(self, path: str) -> Optional[Dict[str, Any]]:
+        """Store a .vsix package.
+
+        Returns:
+            The stored entry (id, version, sha256, size, path), or None if the file is not a valid package
+        """
+        manifest = read_vsix_manifest(path)
+        if manifest is None:
+            return None
+        ext_id = f"{manifest['publisher']}.{manifest['name']}"
+        version = manifest["version"]
+        sha256 = file_sha256(path)
+        object_path = self._object_path(sha256)
+
+        with self._lock:
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                tmp_path = f"{object_path}.{os.getpid()}.tmp"
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, object_path)
+
+            index = self._load()
+            entry = {
+                "id": ext_id,
+                "version": version,
+                "sha256": sha256,
+                "size": os.path.getsize(object_path),
+                "last_used": time.time(),
+                "bundled": bundled_ids(manifest)
+            }
+            index.setdefault(ext_id.lower(), {})[version] = entry
+            self._evict(keep=sha256)
+            self._save()
+        return dict(entry, path=object_path)
+
+    def seed(self, directory: str) -> List[Dict[str, Any]]:
+        """Store every .vsix package found under a directory, returning the stored entries."""
+        entries = []
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith(".vsix"):
+                    entry = self.add(os.path.join(root, name))
+                    if entry:
+                        entries.append(entry)
+        return entries
+
+    def lookup(self, ext_id: str, version: Optional[str] = None) -> Optional[str]:
+        """Get the stored package for an extension, newest version unless one is given.
+
+        Marks the package as recently used. Returns None if it is not stored.
+        """
+        with self._lock:
+            versions = self._load().get(ext_id.lower(), {})
+            candidates = [versions[version]] if version in versions else []
+            if version is None:
+                candidates = sorted(versions.values(), key=lambda entry: version_key(entry["version"]), reverse=True)
+            for entry in candidates:
+                object_path = self._object_path(entry["sha256"])
+                if os.path.exists(object_path):
+                    entry["last_used"] = time.time()
+                    self._save()
+                    return object_path
+        return None
+
+    def bundled(self, ext_id: str) -> List[str]:
+        """Get the lowercased IDs the newest stored package of an extension installs with it."""
+        with self._lock:
+            versions = self._load().get(ext_id.lower(), {})
+            if not versions:
+                return []
+            entry = max(versions.values(), key=lambda entry: version_key(entry["version"]))
+            if "bundled" not in entry:
+                # Stored before packs and dependencies were indexed
+                manifest = read_vsix_manifest(self._object_path(entry["sha256"]))
+                entry["bundled"] = bundled_ids(manifest) if manifest else []
+                self._save()
+            return list(entry["bundled"])
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Get every stored entry, most recently used first."""
+        with self._lock:
+            entries = [dict(entry) for versions in self._load().values() for entry in versions.values()]
+        return sorted(entries, key=lambda entry: entry["last_used"], reverse=True)
+
+    def _evict(self, keep: Optional[str] = None):
+        """Delete least recently used packages until the store fits its cap (call with the lock held)."""
+        index = self._load()
+        entries = sorted(
+            ((ext_key, version, entry) for ext_key, versions in index.items() for version, entry in versions.items()),
+            key=lambda item: item[2]["last_used"]
+        )
+        # Identical packages indexed under several versions are stored once
+        sizes = {entry["sha256"]: entry["size"] for _, _, entry in entries}
+        total = sum(sizes.values())
+
+        for ext_key, version, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry["sha256"] == keep:
+                continue
+            del index[ext_key][version]
+            if not index[ext_key]:
+                del index[ext_key]
+            if not any(e["sha256"] == entry["sha256"] for versions in index.values() for e in versions.values()):
+                total -= sizes[entry["sha256"]]
+                try:
+                    os.remove(self._object_path(entry["sha256"]))
+                except OSError:
+                    pass
+
+    def prune(self):
+        """Evict packages beyond the size cap and drop index entries whose file is gone."""
+        with self._lock:
+            index = self._load()
+            for ext_key in list(index):
+                for version, entry in list(index[ext_key].items()):
+                    if not os.path.exists(self._object_path(entry["sha256"])):
+                        del index[ext_key][version]
+                if not index[ext_key]:
+                    del index[ext_key]
+            self._evict()
+            self._save()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Manage the local VSIX store")
+    parser.add_argument("--dir", help="Store directory (defaults to the per-user cache directory)")
+    parser.add_argument("--max-mb", type=int, help="Size cap in megabytes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Store every .vsix file found under a directory")
+    seed_parser.add_argument("directory")
+    commands.add_parser("list", help="List stored packages, most recently used first")
+    commands.add_parser("prune", help="Evict packages beyond the size cap")
+
+    args = parser.parse_args(argv)
+    max_bytes = args.max_mb * 1024 * 1024 if args.max_mb is not None else DEFAULT_MAX_BYTES
+    cache = VsixCache(args.dir, max_bytes)
+
+    if args.command == "seed":
+        if not os.path.isdir(args.directory):
+            print(f"Not a directory: {args.directory}")
+            sys.exit(1)
+        entries = cache.seed(args.directory)
+        print(f"Stored {len(entries)} packages in {cache.directory}")
+    elif args.command == "list":
+        for entry in cache.entries():
+            print(f"{entry['id']}\t{entry['version']}\t{entry['size']}\t{entry['sha256'][:12]}")
+    elif args.command == "prune":
+        cache.prune()
+        print(f"{len(cache.entries())} packages kept")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+wsl.py - Windows Subsystem for Linux support for Dev Environment Readyifier
+
+This script detects WSL once per process and resolves the Windows user profile
+from the environment variables WSL interop shares with Linux (USERPROFILE,
+LOCALAPPDATA via WSLENV), so Windows-side installs can be probed at exact
+paths instead of globbing `/mnt/c/Users/*` over the slow 9p filesystem. When
+the variables are not shared, `cmd.exe` is asked once and the answer is kept
+in the per-user cache directory. Windows-side path checks are memoized.
+"""
+
+import os
+import re
+import json
+import platform
+import functools
+import subprocess
+import threading
+from typing import Dict, Optional
+
+try:
+    from scripts.detection_cache import default_cache_dir
+except ImportError:
+    from detection_cache import default_cache_dir
+
+# Drive-letter paths such as C:\Users\me
+_WINDOWS_PATH = re.compile(r"^([A-Za-z]):[\\/](.*)$")
+
+_exists_memo: Dict[str, bool] = {}
+_exists_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def is_wsl() -> bool:
+    """Check whether this is a Linux distribution running under WSL."""
+    if platform.system() != "Linux":
+        return False
+    if os.environ.get("WSL_DISTRO_NAME") or os.environ.get("WSL_INTEROP"):
+        return True
+    return "microsoft" in platform.release().lower()
+
+
+def to_wsl_path(windows_path: str) -> Optional[str]:
+    """Convert a Windows path (C:\\Users\\me) to its WSL mount (/mnt/c/Users/me)."""
+    if windows_path.startswith("/"):
+        # Already translated, e.g. shared through WSLENV with the /p flag
+        return windows_path
+    match = _WINDOWS_PATH.match(windows_path.strip())
+    if not match:
+        return None
+    drive, rest = match.groups()
+    return "/mnt/" + drive.lower() + "/" + rest.replace("\\", "/").rstrip("/")
+
+
+def _cache_path() -> str:
+    """Get the file the resolved Windows profile is kept in."""
+    return os.path.join(default_cache_dir(), "wsl.json")
+
+
+def _load_cached_profile() -> Optional[str]:
+    """Get the Windows profile resolved by an earlier run for this distribution and user."""
+    try:
+        with open(_cache_path(), 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("distro") == os.environ.get("WSL_DISTRO_NAME") and data.get("user") == os.environ.get("USER"):
+        return data.get("user_profile")
+    return None
+
+
+def _save_cached_profile(profile: str):
+    """Remember the resolved Windows profile."""
+    try:
+        os.makedirs(os.path.dirname(_cache_path()), exist_ok=True)
+        with open(_cache_path(), 'w') as f:
+            json.dump({
+                "distro": os.environ.get("WSL_DISTRO_NAME"),
+                "user": os.environ.get("USER"),
+                "user_profile": profile
+            }, f)
+    except OSError:
+        pass
+
+
+def _ask_windows(timeout: float) -> Optional[str]:
+    """Ask cmd.exe for %USERPROFILE% through WSL interop."""
+    try:
+        result = subprocess.run(
+            ["cmd.exe", "/c", "echo %USERPROFILE%"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+            # cmd.exe warns about, and falls back from, UNC working directories
+            cwd="/mnt/c" if os.path.isdir("/mnt/c") else None
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return to_wsl_path(result.stdout.strip())
+
+
+@functools.lru_cache(maxsize=None)
+def windows_profile(timeout: float = 5.0) -> Optional[str]:
+    """Get the Windows user profile directory as a WSL path, or None if it cannot be resolved."""
+    if not is_wsl():
+        return None
+
+    profile = to_wsl_path(os.environ.get("USERPROFILE", ""))
+    if profile:
+        return profile
+
+    profile = _load_cached_profile()
+    if profile:
+        return profile
+
+    profile = _ask_windows(timeout)
+    if profile:
+        _save_cached_profile(profile)
+    return profile
+
+
+@functools.lru_cache(maxsize=None)
+def windows_dirs() -> Dict[str, str]:
+    """Get the Windows directories catalog paths may refer to, as WSL paths.
+
+    Keys are the catalog placeholders without braces; directories that cannot
+    be resolved are left out.
+    """
+    if not is_wsl():
+        return {}
+
+    dirs = {
+        "WindowsProgramFiles": to_wsl_path(os.environ.get("ProgramFiles", "")) or "/mnt/c/Program Files"
+    }
+    local = to_wsl_path(os.environ.get("LOCALAPPDATA", ""))
+    if not local:
+        profile = windows_profile()
+        local = profile + "/AppData/Local" if profile else None
+    if local:
+        dirs["WindowsLocalAppData"] = local
+    return dirs
+
+
+def path_exists(path: str) -> bool:
+    """Check whether a path exists, memoizing the answer for Windows-side (/mnt/<drive>) paths."""
+    if not is_wsl() or not path.startswith("/mnt/"):
+        return os.path.exists(path)
+    with _exists_lock:
+        if path in _exists_memo:
+            return _exists_memo[path]
+    exists = os.path.exists(path)
+    with _exists_lock:
+        _exists_memo[path] = exists
+    return exists
+
+
+def clear_memo():
+    """Forget memoized Windows-side path checks, e.g. after installing a Windows application."""
+    with _exists_lock:
+        _exists_memo.clear()
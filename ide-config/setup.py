@@ -10,12 +10,23 @@ import os
 import sys
 import argparse
 from scripts.detector import EnvironmentDetector
+from scripts.detection_profile import DetectionProfiler
+from scripts.detection_daemon import run_daemon
+from scripts import snapshots
+from scripts.vsix_cache import VsixCache
+from scripts.install_progress import format_event
 from scripts.configurator import EnvironmentConfigurator
 from scripts.installer import ToolInstaller
 from scripts.extension_manager import ExtensionManager
 from scripts.repo_context import RepoContextManager
 from scripts.file_structure_manager import FileStructureManager
 
+def print_install_event(event):
+    """Print install progress as it happens."""
+    line = format_event(event)
+    if line:
+        print(line, flush=True)
+
 def main():
     """Main entry point for the application."""
     # Parse command line arguments
@@ -23,8 +34,25 @@ def main():
     parser.add_argument("--no-gui", action="store_true", help="Run in command-line mode")
     parser.add_argument("--install-all", action="store_true", help="Install all missing tools and extensions")
     parser.add_argument("--repo-path", type=str, help="Path to repository for context management")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached detection results and re-detect everything")
+    parser.add_argument("--profile-detection", nargs="?", const="table", choices=["table", "json"],
+                        help="Report the time, subprocesses and cache use of every detection probe, then exit")
+    parser.add_argument("--install-workers", type=int, default=4,
+                        help="Number of IDE profiles and pip installers to install into at the same time")
+    parser.add_argument("--offline", action="store_true",
+                        help="Install extensions only from the local VSIX cache, never from the marketplace")
+    parser.add_argument("--seed-vsix", type=str, metavar="DIR", help="Add every .vsix file under DIR to the local VSIX cache")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="Install, upgrade or downgrade VS Code extensions to the recommended versions")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --install-all or --reconcile run, skipping steps it completed")
+    parser.add_argument("--daemon", action="store_true", help="Keep detection results warm and serve them over a Unix socket")
     args = parser.parse_args()
     
+    if args.daemon:
+        run_daemon()
+        return
+    
     # Determine repository path
     repo_path = args.repo_path if args.repo_path else os.getcwd()
     
@@ -35,12 +63,22 @@ def main():
     print(f"Repository path: {repo_path}")
     print()
     
+    # Pre-seed the VSIX cache so extensions are installed from local disk
+    vsix_cache = VsixCache()
+    if args.seed_vsix:
+        entries = vsix_cache.seed(args.seed_vsix)
+        print(f"Added {len(entries)} VSIX packages from {args.seed_vsix} to the local cache")
+        print()
+    
     # Initialize components
-    detector = EnvironmentDetector()
+    profiler = DetectionProfiler() if args.profile_detection else None
+    detector = EnvironmentDetector(profiler=profiler)
     
     # Detect environments
     print("Detecting installed development environments...")
-    environments = detector.detect_environments()
+    environments = detector.detect_environments(refresh=args.refresh)
+    if environments.get("timed_out_probes"):
+        print(f"Warning: detection timed out for: {', '.join(environments['timed_out_probes'])}")
     
     # Print detected environments
     ide_count = len(environments.get("ides", {}))
@@ -69,16 +107,43 @@ def main():
     
     print()
     
+    # Compare with the previous run's snapshot
+    snapshot_store = snapshots.SnapshotStore()
+    previous_snapshot = snapshot_store.latest()
+    snapshot = snapshots.compact(environments)
+    delta = snapshots.diff(previous_snapshot, snapshot) if previous_snapshot else None
+    if delta is not None:
+        print("Changes since the last run:")
+        print(snapshots.format_diff(delta))
+        print()
+    
     # Initialize remaining components with detected environments
     configurator = EnvironmentConfigurator(environments)
     installer = ToolInstaller(environments, {})  # Empty config for now, will be populated later
-    extension_manager = ExtensionManager(os.path.join(os.path.dirname(__file__), "templates", "recommended_extensions.json"))
+    extensions_config = os.path.join(os.path.dirname(__file__), "templates", "recommended_extensions.json")
+    extension_manager = ExtensionManager(
+        extensions_config,
+        profiler=profiler,
+        max_workers=args.install_workers,
+        vsix_cache=vsix_cache,
+        offline=args.offline
+    )
     repo_context_manager = RepoContextManager(repo_path)
     file_structure_manager = FileStructureManager(repo_path)
     
     # Check for missing extensions
     print("Checking for missing extensions...")
-    missing_extensions = extension_manager.detect_missing_extensions()
+    snapshot["recommended_digest"] = snapshots.file_digest(extensions_config)
+    previous_missing = None
+    changed = None
+    if delta is not None and previous_snapshot.get("recommended_digest") == snapshot["recommended_digest"]:
+        # Only re-check what changed; Insiders extensions are not part of snapshots
+        previous_missing = previous_snapshot.get("missing_extensions")
+        changed = snapshots.changed_environments(delta) | {"vscode_insiders"}
+    missing_extensions = extension_manager.detect_missing_extensions(previous_missing, changed)
+    snapshot["missing_extensions"] = missing_extensions
+    if delta is None or not snapshots.is_empty(delta) or previous_missing != missing_extensions:
+        snapshot_store.save(snapshot)
     if missing_extensions:
         print(f"Found missing extensions in {len(missing_extensions)} environments:")
         for env_name, categories in missing_extensions.items():
@@ -88,6 +153,11 @@ def main():
         print("No missing extensions found.")
     print()
     
+    if profiler:
+        print("Detection profile:")
+        print(profiler.format_json() if args.profile_detection == "json" else profiler.format_table())
+        return
+    
     # Check file sizes
     print("Checking file sizes...")
     large_files = file_structure_manager.check_file_sizes()
@@ -121,12 +191,27 @@ def main():
             print()
     
     # Command-line mode
+    if args.reconcile:
+        print("Reconciling VS Code extensions with the recommended versions...")
+        plans, results = extension_manager.reconcile_extensions(resume=args.resume, progress=print_install_event)
+        for env_name, plan in plans.items():
+            lines = extension_manager.format_plan(plan)
+            print(f"{env_name}: {'up to date' if not lines else ''}")
+            for line in lines:
+                print(f"  {line}")
+        print(f"  - Successfully installed: {len(results['success'])}")
+        print(f"  - Failed installations: {len(results['failed'])}")
+        print()
+    
     if args.install_all:
         # Install all missing extensions
         if missing_extensions:
             print("Installing all missing extensions...")
             selections = {}
             for env_name, categories in missing_extensions.items():
+                if args.reconcile and env_name in ["vscode", "vscode_insiders"]:
+                    # Already brought to the recommended set above
+                    continue
                 selections[env_name] = {}
                 for category, extensions in categories.items():
                     if env_name in ["vscode", "vscode_insiders"]:
@@ -134,7 +219,9 @@ def main():
                     else:
                         selections[env_name][category] = extensions
             
-            results = extension_manager.install_selected_extensions(selections)
+            results = extension_manager.install_selected_extensions(
+                selections, resume=args.resume, progress=print_install_event
+            )
             print("Installation results:")
             print(f"  - Successfully installed: {len(results['success'])}")
             print(f"  - Failed installations: {len(results['failed'])}")
@@ -222,6 +222,165 @@ def validate_mac_compatibility():
     
     return True
 
+def validate_detection_cache_fingerprint(test_dir):
+    """Validate that installing an extension into VSCODE_EXTENSIONS invalidates cached detection results."""
+    print("\n=== Validating Detection Cache Fingerprint ===")
+    
+    from scripts.detector import EnvironmentDetector, PROBE_CATALOG
+    from scripts.detection_cache import DetectionCache
+    from scripts.probe_engine import ProbeEngine
+    
+    extensions_dir = os.path.join(test_dir, "vscode-extensions")
+    os.makedirs(extensions_dir)
+    previous = os.environ.get("VSCODE_EXTENSIONS")
+    os.environ["VSCODE_EXTENSIONS"] = extensions_dir
+    try:
+        detector = EnvironmentDetector(cache=DetectionCache(os.path.join(test_dir, "detection.json")))
+        engine = ProbeEngine(PROBE_CATALOG)
+        before = detector.cache.fingerprint(detector._fingerprint_paths(engine))
+        
+        # Install an extension the way VS Code does: a folder plus an updated extensions.json
+        os.makedirs(os.path.join(extensions_dir, "cline.cline-3.0.0"))
+        with open(os.path.join(extensions_dir, "extensions.json"), "w") as f:
+            f.write('[{"identifier": {"id": "Cline.cline"}, "version": "3.0.0"}]')
+        after = detector.cache.fingerprint(detector._fingerprint_paths(engine))
+    finally:
+        if previous is None:
+            os.environ.pop("VSCODE_EXTENSIONS", None)
+        else:
+            os.environ["VSCODE_EXTENSIONS"] = previous
+    
+    if before != after:
+        print("✓ Installing an extension into VSCODE_EXTENSIONS changes the cache fingerprint")
+        return True
+    print("✗ Cache fingerprint ignores VSCODE_EXTENSIONS")
+    return False
+
+def validate_probe_runner_exit():
+    """Validate that a probe stuck in a blocking call does not hold the process at exit."""
+    print("\n=== Validating Probe Runner Exit ===")
+    
+    import subprocess
+    import time
+    
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import time\n"
+        "from scripts.subprocess_engine import ProbeRunner\n"
+        "runner = ProbeRunner(probe_timeout=1.0, global_timeout=1.0)\n"
+        "results, timed_out = runner.run({'stuck': (lambda: time.sleep(30), None)})\n"
+        "assert timed_out == ['stuck'], timed_out\n"
+    )
+    started = time.monotonic()
+    try:
+        process = subprocess.run([sys.executable, "-c", script], cwd=repo_root, timeout=15,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    except subprocess.TimeoutExpired:
+        print("✗ Process did not exit while a probe was stuck")
+        return False
+    elapsed = time.monotonic() - started
+    
+    if process.returncode != 0:
+        print(f"✗ Probe runner failed: {process.stderr.strip()}")
+        return False
+    if elapsed > 5:
+        print(f"✗ Process took {elapsed:.1f}s to exit after the 1.0s deadline")
+        return False
+    print(f"✓ Process exited {elapsed:.1f}s after starting a probe stuck for 30s")
+    return True
+
+def validate_install_journal(test_dir):
+    """Validate that only an unfinished install run is resumed."""
+    print("\n=== Validating Install Journal ===")
+    
+    from scripts.install_journal import InstallJournal
+    
+    path = os.path.join(test_dir, "journal", "extensions.jsonl")
+    journal = InstallJournal("extensions", path)
+    journal.begin()
+    journal.record("vscode:cline.cline", True)
+    journal.finish()
+    
+    journal.begin(resume=True)
+    if journal.completed_steps():
+        print("✗ Resume continued a run that had finished")
+        return False
+    print("✓ Resume after a finished run starts a new run")
+    
+    # Interrupted: no run_finished record
+    journal.record("vscode:rooveterinaryinc.roo-cline", True)
+    journal.begin(resume=True)
+    if journal.completed_steps() != {"vscode:rooveterinaryinc.roo-cline"}:
+        print("✗ Resume did not continue the interrupted run")
+        return False
+    print("✓ Resume continues the interrupted run")
+    
+    if len([r for r in journal.records() if r["event"] == "run_started"]) != 2:
+        print("✗ Journal records of earlier runs were not kept")
+        return False
+    print("✓ Journal keeps the records of earlier runs")
+    return True
+
+def validate_conda_environments(test_dir):
+    """Validate that environments under a micromamba root without a base environment are found."""
+    print("\n=== Validating Conda Environment Discovery ===")
+    
+    from scripts import conda_envs
+    
+    root = os.path.join(test_dir, "micromamba")
+    env_path = os.path.join(root, "envs", "data")
+    os.makedirs(os.path.join(env_path, "conda-meta"))
+    previous = os.environ.get("MAMBA_ROOT_PREFIX")
+    os.environ["MAMBA_ROOT_PREFIX"] = root
+    try:
+        environments = conda_envs.find_environments(use_cli_fallback=False)
+    finally:
+        if previous is None:
+            os.environ.pop("MAMBA_ROOT_PREFIX", None)
+        else:
+            os.environ["MAMBA_ROOT_PREFIX"] = previous
+    
+    paths = [env["path"] for env in environments]
+    if env_path not in paths:
+        print("✗ Environment under MAMBA_ROOT_PREFIX/envs not found")
+        return False
+    if root in paths:
+        print("✗ Root without conda-meta reported as an environment")
+        return False
+    print("✓ Found the environment under a root without a base environment")
+    return True
+
+def validate_extension_tool_probe(test_dir):
+    """Validate that a tool installed only as a VS Code extension is detected."""
+    print("\n=== Validating Extension-Based Tool Detection ===")
+    
+    import json
+    from scripts.detector import PROBE_CATALOG
+    from scripts.probe_engine import ProbeEngine
+    
+    extensions_dir = os.path.join(test_dir, "probe-extensions")
+    extension_path = os.path.join(extensions_dir, "cline.cline-3.2.1")
+    os.makedirs(extension_path)
+    with open(os.path.join(extension_path, "package.json"), "w") as f:
+        json.dump({"publisher": "Cline", "name": "cline", "version": "3.2.1"}, f)
+    
+    previous = os.environ.get("VSCODE_EXTENSIONS")
+    os.environ["VSCODE_EXTENSIONS"] = extensions_dir
+    try:
+        engine = ProbeEngine(PROBE_CATALOG)
+        result = engine.probe("cline")
+    finally:
+        if previous is None:
+            os.environ.pop("VSCODE_EXTENSIONS", None)
+        else:
+            os.environ["VSCODE_EXTENSIONS"] = previous
+    
+    if result is None or result["path"] not in (extension_path, "pip:cline"):
+        print(f"✗ Cline extension not detected: {result}")
+        return False
+    print("✓ Detected Cline from its VS Code extension")
+    return True
+
 def main():
     """Main validation function."""
     print("=== Dev Environment Readyifier Validation ===")
@@ -239,17 +398,39 @@ def main():
         
         # Validate repository context
         repo_context_success = validate_repo_context(temp_dir)
+        
+        # Validate detection cache invalidation
+        fingerprint_success = validate_detection_cache_fingerprint(temp_dir)
+        
+        # Validate install journal resume
+        journal_success = validate_install_journal(temp_dir)
+        
+        # Validate conda environment discovery
+        conda_success = validate_conda_environments(temp_dir)
+        
+        # Validate detection of extension-based tools
+        extension_probe_success = validate_extension_tool_probe(temp_dir)
     
     # Validate Mac compatibility
     mac_compatibility_success = validate_mac_compatibility()
     
+    # Validate that stuck probes do not delay exit
+    probe_exit_success = validate_probe_runner_exit()
+    
     # Print summary
     print("\n=== Validation Summary ===")
     print(f"File Structure Annotation: {'✓ PASS' if file_structure_success else '✗ FAIL'}")
     print(f"Repository Context: {'✓ PASS' if repo_context_success else '✗ FAIL'}")
     print(f"Mac Compatibility: {'✓ PASS' if mac_compatibility_success else '✗ FAIL'}")
+    print(f"Detection Cache Fingerprint: {'✓ PASS' if fingerprint_success else '✗ FAIL'}")
+    print(f"Probe Runner Exit: {'✓ PASS' if probe_exit_success else '✗ FAIL'}")
+    print(f"Install Journal: {'✓ PASS' if journal_success else '✗ FAIL'}")
+    print(f"Conda Environments: {'✓ PASS' if conda_success else '✗ FAIL'}")
+    print(f"Extension-Based Tools: {'✓ PASS' if extension_probe_success else '✗ FAIL'}")
     
-    overall_success = file_structure_success and repo_context_success and mac_compatibility_success
+    overall_success = (file_structure_success and repo_context_success and mac_compatibility_success
+                       and fingerprint_success and probe_exit_success and journal_success
+                       and conda_success and extension_probe_success)
     print(f"\nOverall Validation: {'✓ PASS' if overall_success else '✗ FAIL'}")
     
     return 0 if overall_success else 1
@@ -0,0 +1,253 @@
+import os
+import time
+import sqlite3
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import redis
+
+from context_watcher import parse_entry_timestamp
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('archiver')
+
+# SQLite database on the LiteFS volume mounted by memory-api
+DEFAULT_DB_PATH = os.path.join(os.environ.get("LITEFS_PATH", "/data"), "context_history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS context_history (
+    project_id TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    token_count INTEGER,
+    max_tokens INTEGER,
+    usage_percentage REAL,
+    PRIMARY KEY (project_id, entry_id)
+);
+CREATE INDEX IF NOT EXISTS idx_context_history_project_task_ts
+    ON context_history (project_id, task_id, ts);
+"""
+
+
+def connect(db_path: str = DEFAULT_DB_PATH, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Open the archive database, creating the schema if needed.
+
+    Args:
+        db_path: Path to the SQLite database file
+        read_only: Open the database in read-only mode (schema is not created)
+    """
+    if read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    else:
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def query_history(
+    project_id: str,
+    task_id: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    limit: int = 1000,
+    db_path: str = DEFAULT_DB_PATH
+) -> List[Dict[str, Any]]:
+    """
+    Query archived context entries for a project.
+
+    Args:
+        project_id: Project whose history to read
+        task_id: Restrict results to a single task (optional)
+        since: Lower bound on timestamp in milliseconds, inclusive (optional)
+        until: Upper bound on timestamp in milliseconds, inclusive (optional)
+        limit: Maximum number of rows to return
+        db_path: Path to the SQLite database file
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    clauses = ["project_id = ?"]
+    params: List[Any] = [project_id]
+    if task_id:
+        clauses.append("task_id = ?")
+        params.append(task_id)
+    if since is not None:
+        clauses.append("ts >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append("ts <= ?")
+        params.append(until)
+    params.append(limit)
+
+    conn = connect(db_path, read_only=True)
+    try:
+        rows = conn.execute(
+            "SELECT entry_id, task_id, ts, token_count, max_tokens, usage_percentage "
+            "FROM context_history WHERE " + " AND ".join(clauses) +
+            " ORDER BY ts LIMIT ?",
+            params
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
+
+
+class StreamArchiver:
+    def __init__(
+        self,
+        redis_host: str = "redis",
+        redis_port: int = 6379,
+        redis_db: int = 0,
+        db_path: str = DEFAULT_DB_PATH,
+        retention_seconds: int = 24 * 60 * 60,  # 24 hours
+        batch_size: int = 500,
+        poll_interval: int = 60  # seconds
+    ):
+        """
+        Initialize the Stream Archiver to move old context entries out of Redis.
+
+        Args:
+            redis_host: Redis server hostname
+            redis_port: Redis server port
+            redis_db: Redis database number
+            db_path: Path to the SQLite archive database
+            retention_seconds: How long entries stay in the Redis stream before archival
+            batch_size: Number of entries read, inserted and deleted per batch
+            poll_interval: How often to run an archival pass (seconds)
+        """
+        self.redis_client = redis.Redis(
+            host=redis_host,
+            port=redis_port,
+            db=redis_db,
+            decode_responses=True
+        )
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.running = False
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def start(self):
+        """Start the archiver process"""
+        self.running = True
+        self.conn = connect(self.db_path)
+        logger.info(f"Stream Archiver started with retention window: {self.retention_seconds}s, database: {self.db_path}")
+
+        try:
+            while self.running:
+                self.archive_all_streams()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Stream Archiver stopped by user")
+        except Exception as e:
+            logger.error(f"Error in Stream Archiver: {str(e)}")
+            raise
+        finally:
+            self.running = False
+            self.conn.close()
+            self.conn = None
+
+    def stop(self):
+        """Stop the archiver process"""
+        self.running = False
+        logger.info("Stream Archiver stopping...")
+
+    def archive_all_streams(self) -> int:
+        """
+        Archive expired entries from all context streams
+
+        Returns:
+            Total number of entries moved to SQLite
+        """
+        if self.conn is None:
+            self.conn = connect(self.db_path)
+
+        cutoff_ms = int((time.time() - self.retention_seconds) * 1000)
+        total = 0
+
+        try:
+            for stream_key in self.redis_client.scan_iter(match="context:*", _type="stream"):
+                total += self._archive_stream(stream_key, cutoff_ms)
+        except redis.RedisError as e:
+            logger.error(f"Redis error while archiving streams: {str(e)}")
+        except sqlite3.Error as e:
+            logger.error(f"SQLite error while archiving streams: {str(e)}")
+
+        if total:
+            logger.info(f"Archived {total} entries older than {self.retention_seconds}s")
+        return total
+
+    def _archive_stream(self, stream_key: str, cutoff_ms: int) -> int:
+        """
+        Move entries older than the cutoff from one stream into SQLite
+
+        Entries are committed to SQLite before they are deleted from Redis, so an
+        interrupted pass only re-reads rows that the primary key then ignores.
+
+        Args:
+            stream_key: Redis stream key to archive
+            cutoff_ms: Entries with an ID timestamp below this are archived
+        """
+        project_id = stream_key.split(":", 1)[1]
+        archived = 0
+
+        while True:
+            # Stream IDs start with their millisecond timestamp, so "(cutoff" is exclusive
+            entries = self.redis_client.xrange(stream_key, min="-", max=f"({cutoff_ms}", count=self.batch_size)
+            if not entries:
+                break
+
+            rows = [self._to_row(project_id, entry_id, data) for entry_id, data in entries]
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO context_history "
+                    "(project_id, entry_id, task_id, ts, token_count, max_tokens, usage_percentage) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            self.redis_client.xdel(stream_key, *[entry_id for entry_id, _ in entries])
+            archived += len(entries)
+
+            if len(entries) < self.batch_size:
+                break
+
+        return archived
+
+    @staticmethod
+    def _to_row(project_id: str, entry_id: str, data: Dict[str, str]) -> Tuple[Any, ...]:
+        """Convert a stream entry into an archive row"""
+        def _number(value: Optional[str], cast):
+            try:
+                return cast(value) if value is not None else None
+            except (ValueError, TypeError):
+                return None
+
+        return (
+            project_id,
+            entry_id,
+            data.get("task_id", ""),
+            # Parsed as the context watcher does, so archived rows and usage state agree
+            parse_entry_timestamp(entry_id, data.get("timestamp")),
+            _number(data.get("token_count"), int),
+            _number(data.get("max_tokens"), int),
+            _number(data.get("usage_percentage"), float)
+        )
+
+
+if __name__ == "__main__":
+    # When run directly, start the archiver process
+    archiver = StreamArchiver(
+        retention_seconds=int(os.environ.get("ARCHIVE_RETENTION_SECONDS", 24 * 60 * 60))
+    )
+    archiver.start()
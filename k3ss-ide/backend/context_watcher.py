@@ -10,6 +10,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger('context_watcher')
 
+# Usage states in escalation order
+USAGE_STATES = ["ok", "warning", "critical", "handover_in_progress", "handed_over"]
+
+
+class UsageStateMachine:
+    def __init__(
+        self,
+        warning_threshold: float = 0.75,  # 75%
+        critical_threshold: float = 0.9,  # 90%
+        hysteresis: Optional[Dict[str, float]] = None
+    ):
+        """
+        Per-task usage state machine with hysteresis on de-escalation.
+        
+        Usage ratios move a task between ok, warning and critical. A state is only
+        left downwards once usage falls below its threshold minus its hysteresis band,
+        so a task hovering around a cutoff does not flap. Handover states are driven
+        by the handover_status reported by the agent. A handed_over task rejoins the
+        usage levels once its fresh context drops below the critical band, so a new
+        critical crossing escalates it again.
+        
+        Args:
+            warning_threshold: Ratio at which a task enters the warning state
+            critical_threshold: Ratio at which a task enters the critical state
+            hysteresis: Band per state ("warning", "critical") subtracted from its
+                threshold before the task may leave that state downwards
+        """
+        self.warning_threshold = warning_threshold
+        self.critical_threshold = critical_threshold
+        self.hysteresis = {"warning": 0.05, "critical": 0.05}
+        self.hysteresis.update(hysteresis or {})
+    
+    def next_state(self, current: str, usage_ratio: float, handover_status: Optional[str] = None) -> str:
+        """
+        Compute the next state for a task
+        
+        Args:
+            current: Current state of the task
+            usage_ratio: Latest token_count/max_tokens ratio
+            handover_status: Optional handover progress reported by the agent
+                ("in_progress" or "complete")
+        """
+        if current in ("critical", "handover_in_progress") and handover_status == "complete":
+            return "handed_over"
+        if current == "critical" and handover_status == "in_progress":
+            return "handover_in_progress"
+        if current == "handover_in_progress":
+            return current
+        if current == "handed_over":
+            if usage_ratio < self.critical_threshold - self.hysteresis["critical"]:
+                return self._usage_level("ok", usage_ratio)
+            return current
+        
+        return self._usage_level(current, usage_ratio)
+    
+    def _usage_level(self, current: str, usage_ratio: float) -> str:
+        """Map a usage ratio to ok/warning/critical, holding the current level within its band"""
+        if usage_ratio >= self.critical_threshold:
+            return "critical"
+        if current == "critical" and usage_ratio >= self.critical_threshold - self.hysteresis["critical"]:
+            return "critical"
+        if usage_ratio >= self.warning_threshold:
+            return "warning"
+        if current in ("warning", "critical") and usage_ratio >= self.warning_threshold - self.hysteresis["warning"]:
+            return "warning"
+        return "ok"
+
+
+def encode_task_state(state: str, usage_ratio: float, timestamp: int) -> str:
+    """Encode a task state as a compact hash value: state|ratio|timestamp"""
+    return f"{state}|{usage_ratio:.4f}|{timestamp}"
+
+
+def decode_task_state(value: str) -> Dict[str, Any]:
+    """Decode a hash value written by encode_task_state"""
+    state, ratio, timestamp = value.split("|")
+    return {"state": state, "usage_ratio": float(ratio), "timestamp": int(timestamp)}
+
+
+def parse_entry_timestamp(entry_id: str, value: Optional[str]) -> int:
+    """Parse a stream entry's timestamp field (fractional values are truncated), falling back to the ms prefix of its stream ID if it is missing or malformed"""
+    try:
+        return int(float(value))
+    except (ValueError, TypeError, OverflowError):
+        return int(entry_id.split('-')[0])
+
+
 class ContextWatcher:
     def __init__(
         self,
@@ -17,17 +104,24 @@ class ContextWatcher:
         redis_port: int = 6379,
         redis_db: int = 0,
         poll_interval: int = 5,  # seconds
-        critical_threshold: float = 0.9  # 90%
+        warning_threshold: float = 0.75,  # 75%
+        critical_threshold: float = 0.9,  # 90%
+        hysteresis: Optional[Dict[str, float]] = None
     ):
         """
-        Initialize the Context Watcher to monitor token usage and set handover flags.
+        Initialize the Context Watcher to monitor token usage and track per-task usage states.
+        
+        Task states are written to one hash per project, usage_state:{project_id},
+        so every task's state can be fetched with a single HGETALL.
         
         Args:
             redis_host: Redis server hostname
             redis_port: Redis server port
             redis_db: Redis database number
             poll_interval: How often to check for updates (seconds)
+            warning_threshold: Threshold ratio (token_count/max_tokens) to enter the warning state
             critical_threshold: Threshold ratio (token_count/max_tokens) to trigger handover
+            hysteresis: Per-state hysteresis bands, see UsageStateMachine
         """
         self.redis_client = redis.Redis(
             host=redis_host,
@@ -37,7 +131,9 @@ class ContextWatcher:
         )
         self.poll_interval = poll_interval
         self.critical_threshold = critical_threshold
+        self.state_machine = UsageStateMachine(warning_threshold, critical_threshold, hysteresis)
         self.stream_positions: Dict[str, str] = {}  # Track last read position for each stream
+        self.task_states: Dict[str, Dict[str, str]] = {}  # Current state per task, keyed by project
         self.running = False
         
     def start(self):
@@ -88,6 +184,7 @@ class ContextWatcher:
         """
         # Get the last position we read from this stream, or start from beginning
         last_id = self.stream_positions.get(stream_key, '0-0')
+        project_id = stream_key.split(":", 1)[1]
         
         try:
             # Read new entries from the stream
@@ -95,52 +192,77 @@ class ContextWatcher:
             
             if not entries:
                 return
+            
+            states = self._load_task_states(project_id)
+            updates: Dict[str, str] = {}
                 
             # Process each entry
             for stream_name, stream_entries in entries:
                 for entry_id, data in stream_entries:
-                    self._process_entry(entry_id, data)
+                    update = self._process_entry(entry_id, data, states)
+                    if update:
+                        updates.update(update)
                     
                     # Update the last processed position
                     self.stream_positions[stream_key] = entry_id
+            
+            # Write all task states for the batch in one round trip
+            if updates:
+                self.redis_client.hset(f"usage_state:{project_id}", mapping=updates)
         
         except redis.RedisError as e:
             logger.error(f"Redis error while processing stream {stream_key}: {str(e)}")
     
-    def _process_entry(self, entry_id: str, data: Dict[str, str]):
+    def _load_task_states(self, project_id: str) -> Dict[str, str]:
+        """
+        Get the known task states for a project, seeding them from Redis on first use
+        
+        Args:
+            project_id: Project whose task states to load
+        """
+        if project_id not in self.task_states:
+            stored = self.redis_client.hgetall(f"usage_state:{project_id}")
+            self.task_states[project_id] = {
+                task_id: decode_task_state(value)["state"]
+                for task_id, value in stored.items()
+            }
+        return self.task_states[project_id]
+    
+    def _process_entry(self, entry_id: str, data: Dict[str, str], states: Dict[str, str]) -> Optional[Dict[str, str]]:
         """
-        Process a single stream entry and set handover flag if needed
+        Process a single stream entry and advance the task's usage state
         
         Args:
             entry_id: Redis stream entry ID
             data: Entry data containing task_id, token_count, max_tokens, etc.
+            states: Current task states for the entry's project, updated in place
+            
+        Returns:
+            Mapping of task_id to encoded state for the project hash, or None
         """
         try:
             task_id = data.get('task_id')
             
             if not task_id:
                 logger.warning(f"Entry {entry_id} missing task_id, skipping")
-                return
+                return None
                 
             # Get token counts
             token_count = int(data.get('token_count', 0))
             max_tokens = int(data.get('max_tokens', 1))  # Default to 1 to avoid division by zero
+            timestamp = parse_entry_timestamp(entry_id, data.get('timestamp'))
             
             # Calculate usage ratio
             usage_ratio = token_count / max_tokens
             
-            # Check if we need to set the handover flag
-            if usage_ratio >= self.critical_threshold:
-                logger.warning(
-                    f"Critical token usage for task {task_id}: "
-                    f"{token_count}/{max_tokens} tokens "
-                    f"({usage_ratio:.1%})"
-                )
-                
-                # Set the handover required flag in Redis
-                handover_key = f"handover_required:{task_id}"
-                self.redis_client.set(handover_key, "true")
-                logger.info(f"Set handover flag: {handover_key} = true")
+            current = states.get(task_id, "ok")
+            new_state = self.state_machine.next_state(current, usage_ratio, data.get('handover_status'))
+            states[task_id] = new_state
+            
+            if new_state != current:
+                self._on_transition(task_id, current, new_state, token_count, max_tokens, usage_ratio)
+            
+            return {task_id: encode_task_state(new_state, usage_ratio, timestamp)}
             
         except (ValueError, TypeError) as e:
             logger.error(f"Error parsing data for entry {entry_id}: {str(e)}")
@@ -148,6 +270,36 @@ class ContextWatcher:
             logger.error(f"Redis error while setting handover flag: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error processing entry {entry_id}: {str(e)}")
+        return None
+    
+    def _on_transition(
+        self,
+        task_id: str,
+        old_state: str,
+        new_state: str,
+        token_count: int,
+        max_tokens: int,
+        usage_ratio: float
+    ):
+        """Log a state change and keep the legacy handover_required flag in sync"""
+        logger.info(
+            f"Task {task_id} moved from {old_state} to {new_state}: "
+            f"{token_count}/{max_tokens} tokens ({usage_ratio:.1%})"
+        )
+        
+        handover_key = f"handover_required:{task_id}"
+        if new_state == "critical" and old_state in ("ok", "warning"):
+            logger.warning(
+                f"Critical token usage for task {task_id}: "
+                f"{token_count}/{max_tokens} tokens "
+                f"({usage_ratio:.1%})"
+            )
+            
+            # Set the handover required flag in Redis
+            self.redis_client.set(handover_key, "true")
+            logger.info(f"Set handover flag: {handover_key} = true")
+        elif new_state in ("ok", "warning", "handed_over"):
+            self.redis_client.delete(handover_key)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,9 @@ import json
 import time
 from typing import Dict, Any, Optional
 
+from archiver import query_history
+from context_watcher import decode_task_state
+
 app = FastAPI()
 
 # Redis connection
@@ -19,6 +22,7 @@ async def context_ping(request: Request) -> Dict[str, Any]:
     - token_count: Current token count used by the task
     - max_tokens: Maximum token limit for the task
     - timestamp: Time of the ping (optional, will use server time if not provided)
+    - handover_status: Handover progress, "in_progress" or "complete" (optional)
     
     Writes data to Redis stream with key format: context:{project_id}
     """
@@ -47,6 +51,8 @@ async def context_ping(request: Request) -> Dict[str, Any]:
             "timestamp": str(timestamp),
             "usage_percentage": str(round((data["token_count"] / data["max_tokens"]) * 100, 2))
         }
+        if data.get("handover_status") in ("in_progress", "complete"):
+            stream_data["handover_status"] = data["handover_status"]
         
         # Write to Redis stream
         stream_key = f"context:{project_id}"
@@ -66,6 +72,50 @@ async def context_ping(request: Request) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
+@app.get("/usage-state/{project_id}")
+async def usage_state(project_id: str) -> Dict[str, Any]:
+    """
+    Endpoint to read the usage state of every task in a project.
+    
+    States are maintained by the context watcher in the usage_state:{project_id}
+    hash and are returned keyed by task_id.
+    """
+    try:
+        stored = redis_client.hgetall(f"usage_state:{project_id}")
+        return {
+            "project_id": project_id,
+            "tasks": {task_id: decode_task_state(value) for task_id, value in stored.items()}
+        }
+    except redis.RedisError as e:
+        raise HTTPException(status_code=500, detail=f"Redis error: {str(e)}")
+
+@app.get("/context-history/{project_id}")
+async def context_history(
+    project_id: str,
+    task_id: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    limit: int = 1000
+) -> Dict[str, Any]:
+    """
+    Endpoint to read context entries archived from Redis to SQLite.
+    
+    Query parameters:
+    - task_id: Restrict results to a single task (optional)
+    - since: Earliest timestamp in milliseconds (optional)
+    - until: Latest timestamp in milliseconds (optional)
+    - limit: Maximum number of entries to return (default 1000)
+    """
+    try:
+        entries = query_history(project_id, task_id=task_id, since=since, until=until, limit=limit)
+        return {
+            "project_id": project_id,
+            "count": len(entries),
+            "entries": entries
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading context history: {str(e)}")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check() -> Dict[str, str]: